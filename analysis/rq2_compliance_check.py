@@ -18,7 +18,12 @@ Constraints checked:
 
 Usage:
     python rq2_compliance_check.py --repo_root "D:\\Desktop\\analysis\\rq2"
-    
+
+Optional:
+    --jobs   <int>   Worker processes for parsing Java files (0 = one per CPU, the default)
+    --cache  <path>  Pickle cache of parsed files; unchanged files (mtime + size)
+                     are not re-parsed on the next run
+
 Output:
     D:\\Desktop\\analysis\\rq2_compliance_results.csv
     D:\\Desktop\\analysis\\rq2_violations_detail.csv
@@ -26,10 +31,14 @@ Output:
 
 import os
 import re
+import sys
 import csv
+import pickle
 import argparse
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Tuple, NamedTuple, Optional
 
 
 # =========================
@@ -51,21 +60,23 @@ APP_FORBIDDEN_IMPORTS = [
     r"\.infrastructure\.",
 ]
 
+# Suffix lists are tuples so a single str.endswith(tuple) call tests them all.
+
 # C5: Required suffixes for adapter classes
-ADAPTER_SUFFIXES = [
+ADAPTER_SUFFIXES = (
     "Adapter", "Controller", "Repository", "Client",
     "Publisher", "Listener", "Mapper", "Config"
-]
+)
 
 # C5: Exclusions for DTO-like types that may live under adapter packages
-DTO_LIKE_SUFFIXES = [
+DTO_LIKE_SUFFIXES = (
     "Dto", "DTO", "Request", "Response", "Command", "Query", "Payload"
-]
+)
 
 # C7: Exclusions for non-service types that may live under *service* packages
-C7_EXCLUDED_SUFFIXES = [
+C7_EXCLUDED_SUFFIXES = (
     "Policy", "Validator", "Exception", "Test", "IT", "Spec"
-]
+)
 
 # C7: Scope control — by default, only enforce suffixes in application service packages
 C7_ENFORCE_ONLY_APPLICATION_SERVICES = True
@@ -74,7 +85,7 @@ C7_ENFORCE_ONLY_APPLICATION_SERVICES = True
 # checked in *.domain.event.* or *.domain.events.* packages
 
 # C7: Service classes must end with BIAN-style suffixes
-SERVICE_SUFFIXES = ["Service", "ServiceDomain", "Saga", "Orchestrator"]
+SERVICE_SUFFIXES = ("Service", "ServiceDomain", "Saga", "Orchestrator")
 
 # C8: Expected OpenAPI files per bounded context
 EXPECTED_OPENAPI_FILES = [
@@ -95,37 +106,152 @@ SHARED_KERNEL_FORBIDDEN = [
     r"java\.sql\.",
 ]
 
+# Each forbidden-import list combined into one alternation (one search per import)
+DOMAIN_FORBIDDEN_RE        = re.compile("|".join(f"(?:{p})" for p in DOMAIN_FORBIDDEN_IMPORTS))
+APP_FORBIDDEN_RE           = re.compile("|".join(f"(?:{p})" for p in APP_FORBIDDEN_IMPORTS))
+SHARED_KERNEL_FORBIDDEN_RE = re.compile("|".join(f"(?:{p})" for p in SHARED_KERNEL_FORBIDDEN))
+
+# C2: Persistence-related imports (matched against the lower-cased import)
+C2_PERSISTENCE_RE = re.compile(r"(persistence|jpa|hibernate|jdbc|sql)")
+
 # C10: Cross-context direct class imports (heuristic)
 # Flag if a bounded context imports another bounded context's non-port package
 BOUNDED_CONTEXT_PACKAGES = [
     "openfinance", "payment", "loan", "risk", "customer", "compliance"
 ]
 
+# C10: Package prefixes owned by each bounded context
+BOUNDED_CONTEXT_PREFIXES = {
+    "openfinance": ["com.enterprise.openfinance", "com.bank.openfinance"],
+    "payment":     ["com.bank.payment"],
+    "loan":        ["com.bank.loan"],
+    "risk":        ["com.amanahfi.risk", "com.bank.risk"],
+    "customer":    ["com.bank.customer"],
+    "compliance":  ["com.amanahfi.compliance", "com.bank.compliance"],
+}
+
+# Directories skipped when collecting Java files (build output, VCS, IDE)
+SKIP_DIRS = {"target", "build", ".git", "node_modules", ".idea", ".gradle", "out", "bin"}
+
+# C5/C6/C7: directory fragments a file must lie under to possibly be in an
+# adapter / domain event / service package. Relies on the standard Maven/Gradle
+# layout where source directories mirror package names.
+NAMING_PATH_HINTS = (
+    "/infrastructure/adapter",
+    "/domain/event",
+    "/application/service" if C7_ENFORCE_ONLY_APPLICATION_SERVICES else "/service",
+)
+
+# Write buffer for the streamed violations CSV: rows are coalesced into
+# large writes instead of hitting the OS once per few rows
+CSV_WRITE_BUFFER = 1 << 20
+
+# Files per worker task when scanning in parallel (amortizes pickling overhead)
+SCAN_CHUNK_SIZE = 256
+
+# C10: (prefix, context) pairs sorted by prefix for bisect lookups.
+# Assumes no configured prefix is itself a prefix of another one.
+_CTX_PREFIX_TABLE = sorted((p, ctx) for ctx, ps in BOUNDED_CONTEXT_PREFIXES.items() for p in ps)
+_CTX_PREFIX_KEYS  = [p for p, _ in _CTX_PREFIX_TABLE]
+_CTX_OF_PREFIX    = [ctx for _, ctx in _CTX_PREFIX_TABLE]
+
+# Literal gates: an import can only violate C3/C4/C9/C10 if the raw file bytes
+# contain one of these substrings, so imports are only parsed for such files.
+LITERAL_GATES = (
+    b"persistence", b"hibernate", b"springframework", b"java.sql", b".infrastructure.",
+) + tuple(p.encode() for ps in BOUNDED_CONTEXT_PREFIXES.values() for p in ps)
+
 
 # =========================
 # HELPERS
 # =========================
 
-def find_java_files(root: str) -> List[Path]:
-    return list(Path(root).rglob("*.java"))
-
+# Path helpers take `norm_path`: the lower-cased, forward-slash path string
+# computed once per file by the scan.
 
-def read_file(path: Path) -> str:
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
+def find_java_files(root: str) -> List[Path]:
+    """
+    Iterative os.scandir walk collecting *.java files.
+    Build output / VCS / IDE directories (SKIP_DIRS) are not descended into,
+    except below a `src` directory where such names are ordinary packages.
+    Symlinked directories are not followed.
+    """
+    found = []
+    stack = [(root, False)]
+    while stack:
+        d, in_src = stack.pop()
         try:
-            return path.read_text(encoding=enc, errors="strict")
-        except (UnicodeDecodeError, OSError):
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        if in_src or e.name not in SKIP_DIRS:
+                            stack.append((e.path, in_src or e.name == "src"))
+                    elif e.name.endswith(".java") and e.is_file():
+                        found.append(Path(e.path))
+        except OSError:
             continue
-    return path.read_text(encoding="utf-8", errors="ignore")
+    return found
+
+
+def load_source(path: Path) -> bytes:
+    """Read a source file once as bytes, without a UTF-8 byte order mark."""
+    raw = path.read_bytes()
+    if raw.startswith(b"\xef\xbb\xbf"):
+        raw = raw[3:]
+    return raw
+
+
+def decode_source(raw: bytes) -> str:
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+_PKG_RE = re.compile(r"^\s*package\s+([\w.]+)\s*;", re.MULTILINE)
+
+# package/import statements, or the first type declaration (after which
+# no package/import statement can follow). The declaration must be followed
+# by `{`, `<`, `(` or extends/implements/permits, so header prose such as
+# "interface with ..." or "record of changes" does not end the scan early.
+_PKG_IMP_RE = re.compile(
+    r"^\s*(?:(package|import)\s+([\w.*]+)\s*;"
+    r"|(?:(?:public|protected|private|abstract|final|sealed|non-sealed|static|strictfp)\s+)*"
+    r"(?:class|interface|enum|record|@interface)\s+\w+\s*"
+    r"(?:[<{(]|(?:extends|implements|permits)\b))",
+    re.MULTILINE,
+)
 
 
 def get_package(content: str) -> str:
-    m = re.search(r"^\s*package\s+([\w.]+)\s*;", content, re.MULTILINE)
+    m = _PKG_RE.search(content)
     return m.group(1) if m else ""
 
 
-def get_imports(content: str) -> List[str]:
-    return re.findall(r"^\s*import\s+([\w.*]+)\s*;", content, re.MULTILINE)
+def parse_pkg_imports(content: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Single regex pass returning (package, imports).
+    Stops at the first type declaration, so method bodies are never scanned.
+    """
+    pkg = ""
+    imports = []
+    for m in _PKG_IMP_RE.finditer(content):
+        kw = m.group(1)
+        if kw is None:
+            break
+        if kw == "import":
+            imports.append(m.group(2))
+        elif not pkg:
+            pkg = m.group(2)
+    return pkg, tuple(imports)
+
+
+def lookup_context(name: str) -> Optional[str]:
+    """Bounded context whose package prefix starts `name`, via binary search."""
+    i = bisect_right(_CTX_PREFIX_KEYS, name) - 1
+    if i >= 0 and name.startswith(_CTX_PREFIX_KEYS[i]):
+        return _CTX_OF_PREFIX[i]
+    return None
 
 
 def get_classname(path: Path) -> str:
@@ -150,9 +276,8 @@ def is_adapter_package(pkg: str) -> bool:
 
 
 
-def is_test_path(path: Path) -> bool:
-    p = str(path).lower().replace("\\", "/")
-    return "/src/test/" in p or p.endswith("test.java") or "/test/" in p
+def is_test_path(norm_path: str) -> bool:
+    return "/src/test/" in norm_path or norm_path.endswith("test.java") or "/test/" in norm_path
 
 
 def is_dto_package(pkg: str) -> bool:
@@ -160,11 +285,11 @@ def is_dto_package(pkg: str) -> bool:
 
 
 def is_dto_like_classname(classname: str) -> bool:
-    return any(classname.endswith(s) for s in DTO_LIKE_SUFFIXES)
+    return classname.endswith(DTO_LIKE_SUFFIXES)
 
 
 def is_excluded_c7_classname(classname: str) -> bool:
-    return any(classname.endswith(s) for s in C7_EXCLUDED_SUFFIXES)
+    return classname.endswith(C7_EXCLUDED_SUFFIXES)
 
 
 def is_application_service_package(pkg: str) -> bool:
@@ -181,35 +306,175 @@ def is_service_package(pkg: str) -> bool:
             pkg.endswith(".service"))
 
 
-def is_shared_kernel(path: Path) -> bool:
-    p = str(path).lower().replace("\\", "/")
-    return "shared-kernel" in p or "shared_kernel" in p or \
-           "common-domain" in p or "common_domain" in p
+def is_shared_kernel(norm_path: str) -> bool:
+    return "shared-kernel" in norm_path or "shared_kernel" in norm_path or \
+           "common-domain" in norm_path or "common_domain" in norm_path
 
 
-def is_uc03_infrastructure(path: Path) -> bool:
-    p = str(path).lower().replace("\\", "/")
-    return "uc03" in p and "infrastructure" in p
+def is_uc03_infrastructure(norm_path: str) -> bool:
+    return "uc03" in norm_path and "infrastructure" in norm_path
 
 
-def is_uc03_domain_or_app(path: Path) -> bool:
-    p = str(path).lower().replace("\\", "/")
-    return "uc03" in p and ("domain" in p or "application" in p)
+def is_uc03_domain_or_app(norm_path: str) -> bool:
+    return "uc03" in norm_path and ("domain" in norm_path or "application" in norm_path)
+
+
+# =========================
+# REPO SCAN
+# =========================
+
+class FileRecord(NamedTuple):
+    """Metadata of one Java file, parsed once and shared by all checks."""
+    path: Path
+    pkg: str
+    imports: Tuple[str, ...]
+    classname: str
+    norm_path: str
+    is_test: bool
+    is_shared: bool
+    is_uc03_matching: bool
+    is_domain_pkg: bool
+    is_app_pkg: bool
+    is_adapter_pkg: bool
+    is_dto_pkg: bool
+    is_domain_event_pkg: bool
+    is_app_service_pkg: bool
+    is_service_pkg: bool
+    needs_regex: bool
+
+
+def _scan_file(jf: Path, strings: Dict[str, str]) -> FileRecord:
+    raw = load_source(jf)
+    norm_path = jf.as_posix().lower()
+    is_uc03_matching = "uc03" in norm_path and "matching" in norm_path
+    needs_regex = any(g in raw for g in LITERAL_GATES)
+    # C2 matches persistence imports case-insensitively, so its
+    # (path-selected) files always get their imports parsed
+    if needs_regex or is_uc03_matching:
+        pkg, imports = parse_pkg_imports(decode_source(raw))
+    elif any(hint in norm_path for hint in NAMING_PATH_HINTS):
+        pkg, imports = get_package(decode_source(raw)), ()
+    else:
+        # No check can use this file's package: skip decoding it
+        pkg, imports = "", ()
+    # Share one string object per distinct package/import name
+    pkg = strings.setdefault(pkg, pkg)
+    imports = tuple(strings.setdefault(imp, imp) for imp in imports)
+    # All path/package classification is done here, once per file (and in the
+    # worker process), so the checks are plain filters over these flags.
+    return FileRecord(
+        path=jf,
+        pkg=pkg,
+        imports=imports,
+        classname=get_classname(jf),
+        norm_path=norm_path,
+        is_test=is_test_path(norm_path),
+        is_shared=is_shared_kernel(norm_path),
+        is_uc03_matching=is_uc03_matching,
+        is_domain_pkg=is_domain_package(pkg),
+        is_app_pkg=is_application_package(pkg),
+        is_adapter_pkg=is_adapter_package(pkg),
+        is_dto_pkg=is_dto_package(pkg),
+        is_domain_event_pkg=is_domain_event_package(pkg),
+        is_app_service_pkg=is_application_service_package(pkg),
+        is_service_pkg=is_service_package(pkg),
+        needs_regex=needs_regex,
+    )
+
+
+def _scan_chunk(paths: List[Path]) -> List[FileRecord]:
+    # Deduplicated strings are also pickled only once per chunk (pickle memoizes by identity)
+    strings: Dict[str, str] = {}
+    return [_scan_file(jf, strings) for jf in paths]
+
+
+def _parse_files(files: List[Path], jobs: Optional[int]) -> List[FileRecord]:
+    chunks = [files[i:i + SCAN_CHUNK_SIZE] for i in range(0, len(files), SCAN_CHUNK_SIZE)]
+    if jobs == 1 or len(chunks) <= 1:
+        return _scan_chunk(files)
+
+    records = []
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        for chunk_records in ex.map(_scan_chunk, chunks):
+            # Re-intern packages across chunks (interning does not survive pickling)
+            records.extend(rec._replace(pkg=sys.intern(rec.pkg)) for rec in chunk_records)
+    return records
+
+
+def load_scan_cache(cache_path: str) -> Dict[str, Tuple[int, int, FileRecord]]:
+    """
+    Load cached records keyed by file path.
+    The whole cache is discarded if this script was modified after it was written.
+    """
+    try:
+        if os.path.getmtime(cache_path) < os.path.getmtime(__file__):
+            return {}
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, AttributeError, pickle.UnpicklingError):
+        return {}
+
+
+def save_scan_cache(cache_path: str, cache: Dict[str, Tuple[int, int, FileRecord]]) -> None:
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def scan_repo(repo_root: str, jobs: Optional[int] = None,
+              cache_path: Optional[str] = None) -> List[FileRecord]:
+    """
+    Walk the repository once, read every Java file once and extract the
+    metadata needed by the constraint checks.
+    Files are parsed in chunks across `jobs` worker processes (default: one per
+    CPU; regex work is CPU-bound); record order follows the file walk.
+    With `cache_path`, files whose mtime and size are unchanged since the
+    previous run reuse their cached record instead of being re-parsed.
+    """
+    files = find_java_files(repo_root)
+    if not cache_path:
+        return _parse_files(files, jobs)
+
+    cache = load_scan_cache(cache_path)
+    new_cache = {}
+    records: List[Optional[FileRecord]] = [None] * len(files)
+    stale = []
+    for i, jf in enumerate(files):
+        st = jf.stat()
+        key = str(jf)
+        hit = cache.get(key)
+        if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            records[i] = hit[2]
+            new_cache[key] = hit
+        else:
+            stale.append((i, st))
+
+    parsed = _parse_files([files[i] for i, _ in stale], jobs)
+    for (i, st), rec in zip(stale, parsed):
+        records[i] = rec
+        new_cache[str(rec.path)] = (st.st_mtime_ns, st.st_size, rec)
+
+    print(f"Cache     : {len(files) - len(stale)} reused, {len(stale)} parsed")
+    save_scan_cache(cache_path, new_cache)
+    return records
 
 
 # =========================
 # CONSTRAINT CHECKS
 # =========================
 
-def check_c1_c2(repo_root: str) -> Tuple[Dict, List[Dict]]:
+# Callback receiving (constraint_id, file, issue) for each violation found
+ViolationWriter = Callable[[str, str, str], None]
+
+
+def check_c1(repo_root: str, records: List[FileRecord],
+             write_violation: ViolationWriter) -> Dict:
     """
     C1: Stateless API layer — audit persistence separated from runtime.
         Check: UC03 infrastructure has separate audit and matching packages.
-    C2: Fuzzy matching index isolated from transactional systems.
-        Check: UC03 matching package does not import persistence packages.
     """
     results = {}
-    violations = []
 
     uc03_infra = Path(repo_root) / "open-finance-context" / "open-finance-infrastructure" / \
                  "src" / "main" / "java"
@@ -219,18 +484,17 @@ def check_c1_c2(repo_root: str) -> Tuple[Dict, List[Dict]]:
     cache_pkg = False
     matching_pkg = False
 
-    for d in uc03_infra.rglob("*"):
-        if not d.is_dir():
+    # A subdirectory is "under uc03" when its parent path has a uc03 part
+    # (the subdirectory's own name is never uc03 when it is audit/cache/matching).
+    for dirpath, dirnames, _ in os.walk(uc03_infra):
+        if "uc03" not in (p.lower() for p in Path(dirpath).parts):
             continue
-        name = d.name.lower()
-        parts = [p.lower() for p in d.parts]
-        if "uc03" in parts:
-            if name == "audit":
-                audit_pkg = True
-            if name == "cache":
-                cache_pkg = True
-            if name == "matching":
-                matching_pkg = True
+        names = {d.lower() for d in dirnames}
+        audit_pkg = audit_pkg or "audit" in names
+        cache_pkg = cache_pkg or "cache" in names
+        matching_pkg = matching_pkg or "matching" in names
+        if audit_pkg and cache_pkg and matching_pkg:
+            break
 
     c1_compliant = audit_pkg and cache_pkg
     results["C1"] = {
@@ -240,341 +504,232 @@ def check_c1_c2(repo_root: str) -> Tuple[Dict, List[Dict]]:
         "detail": f"audit_pkg={audit_pkg}, cache_pkg={cache_pkg}"
     }
     if not c1_compliant:
-        violations.append({
-            "constraint_id": "C1",
-            "file": "open-finance-context/open-finance-infrastructure/.../uc03",
-            "issue": "Expected separate audit and cache packages under UC03 infrastructure"
-        })
-
-    # C2: Fuzzy matching (uc03/infrastructure/matching) should not import persistence
-    c2_violations = []
-    for jf in find_java_files(repo_root):
-        p = str(jf).lower().replace("\\", "/")
-        if "uc03" not in p or "matching" not in p:
-            continue
-        content = read_file(jf)
-        imports = get_imports(content)
-        for imp in imports:
-            if re.search(r"(persistence|jpa|hibernate|jdbc|sql)", imp.lower()):
-                c2_violations.append({
-                    "constraint_id": "C2",
-                    "file": str(jf),
-                    "issue": f"Matching package imports persistence: {imp}"
-                })
-
-    results["C2"] = {
-        "constraint": "Fuzzy matching index isolated from transactional systems",
-        "method": "Import scan: UC03 matching package must not import persistence",
-        "compliant": len(c2_violations) == 0,
-        "detail": f"{len(c2_violations)} violation(s) found"
-    }
-    violations.extend(c2_violations)
-    return results, violations
+        write_violation(
+            "C1", "open-finance-context/open-finance-infrastructure/.../uc03",
+            "Expected separate audit and cache packages under UC03 infrastructure")
+
+    return results
 
 
-def check_c3(repo_root: str) -> Tuple[Dict, List[Dict]]:
+def check_import_rules(repo_root: str, records: List[FileRecord],
+                       write_violation: ViolationWriter) -> Dict:
     """
-    C3: Domain layer must be framework/infrastructure independent.
-        Check: No forbidden imports in *.domain.* packages.
+    Import-scan constraints, evaluated in a single pass over records and imports.
+    C2:  Fuzzy matching index isolated from transactional systems.
+         Check: UC03 matching package does not import persistence packages.
+    C3:  Domain layer must be framework/infrastructure independent.
+         Check: No forbidden imports in *.domain.* packages.
+    C4:  Application layer depends on domain ports, not infrastructure adapters.
+         Check: No *.infrastructure.* imports in *.application.* packages.
+    C9:  Shared libraries remain code-level only (no shared persistence).
+         Check: No persistence imports in shared-kernel or common-domain.
+    C10: Cross-context access via explicit OpenAPI contracts and event topics.
+         Heuristic: Flag direct imports of another bounded context's non-port package.
     """
-    violations = []
-    patterns = [re.compile(p) for p in DOMAIN_FORBIDDEN_IMPORTS]
+    counts = {"C2": 0, "C3": 0, "C4": 0, "C9": 0, "C10": 0}
 
-    for jf in find_java_files(repo_root):
-        content = read_file(jf)
-        pkg = get_package(content)
-        if not is_domain_package(pkg):
+    for rec in records:
+        if not rec.imports:
             continue
-        imports = get_imports(content)
-        for imp in imports:
-            for pat in patterns:
-                if pat.search(imp):
-                    violations.append({
-                        "constraint_id": "C3",
-                        "file": str(jf),
-                        "issue": f"Domain imports forbidden dependency: {imp}"
-                    })
-                    break
+
+        c2 = rec.is_uc03_matching
+        # C3/C4/C9/C10 violations require one of the literal gates in the file
+        if rec.needs_regex:
+            c3, c4, c9 = rec.is_domain_pkg, rec.is_app_pkg, rec.is_shared
+            # Determine which context this file belongs to
+            own_ctx = lookup_context(rec.pkg) if rec.pkg else None
+        else:
+            c3 = c4 = c9 = False
+            own_ctx = None
+        if not (c2 or c3 or c4 or c9 or own_ctx):
+            continue
+
+        file = str(rec.path)
+        for imp in rec.imports:
+            if c2 and C2_PERSISTENCE_RE.search(imp.lower()):
+                write_violation("C2", file, f"Matching package imports persistence: {imp}")
+                counts["C2"] += 1
+            if c3 and DOMAIN_FORBIDDEN_RE.search(imp):
+                write_violation("C3", file, f"Domain imports forbidden dependency: {imp}")
+                counts["C3"] += 1
+            if c4 and APP_FORBIDDEN_RE.search(imp):
+                write_violation("C4", file, f"Application imports infrastructure: {imp}")
+                counts["C4"] += 1
+            if c9 and SHARED_KERNEL_FORBIDDEN_RE.search(imp):
+                write_violation("C9", file, f"Shared kernel imports persistence: {imp}")
+                counts["C9"] += 1
+            if own_ctx:
+                ctx = lookup_context(imp)
+                # Allow port imports (cross-context via port is OK)
+                if ctx is not None and ctx != own_ctx and ".port." not in imp and ".api." not in imp:
+                    write_violation("C10", file, f"Direct cross-context import from '{ctx}': {imp}")
+                    counts["C10"] += 1
 
     return {
+        "C2": {
+            "constraint": "Fuzzy matching index isolated from transactional systems",
+            "method": "Import scan: UC03 matching package must not import persistence",
+            "compliant": counts["C2"] == 0,
+            "detail": f"{counts['C2']} violation(s) found"
+        },
         "C3": {
             "constraint": "Domain layer must be framework/infrastructure independent",
             "method": "Import scan: forbidden imports in *.domain.* packages",
-            "compliant": len(violations) == 0,
-            "detail": f"{len(violations)} violation(s) found"
-        }
-    }, violations
-
-
-def check_c4(repo_root: str) -> Tuple[Dict, List[Dict]]:
-    """
-    C4: Application layer depends on domain ports, not infrastructure adapters.
-        Check: No *.infrastructure.* imports in *.application.* packages.
-    """
-    violations = []
-    patterns = [re.compile(p) for p in APP_FORBIDDEN_IMPORTS]
-
-    for jf in find_java_files(repo_root):
-        content = read_file(jf)
-        pkg = get_package(content)
-        if not is_application_package(pkg):
-            continue
-        imports = get_imports(content)
-        for imp in imports:
-            for pat in patterns:
-                if pat.search(imp):
-                    violations.append({
-                        "constraint_id": "C4",
-                        "file": str(jf),
-                        "issue": f"Application imports infrastructure: {imp}"
-                    })
-                    break
-
-    return {
+            "compliant": counts["C3"] == 0,
+            "detail": f"{counts['C3']} violation(s) found"
+        },
         "C4": {
             "constraint": "Application layer depends on domain ports, not infrastructure adapters",
             "method": "Import scan: *.infrastructure.* forbidden in *.application.* packages",
-            "compliant": len(violations) == 0,
-            "detail": f"{len(violations)} violation(s) found"
-        }
-    }, violations
+            "compliant": counts["C4"] == 0,
+            "detail": f"{counts['C4']} violation(s) found"
+        },
+        "C9": {
+            "constraint": "Shared libraries remain code-level only (no shared persistence)",
+            "method": "Import scan: persistence imports forbidden in shared-kernel/common-domain",
+            "compliant": counts["C9"] == 0,
+            "detail": f"{counts['C9']} violation(s) found"
+        },
+        "C10": {
+            "constraint": "Cross-context access via explicit OpenAPI contracts and event topics",
+            "method": "Import scan: direct cross-context imports (non-port) flagged as violations",
+            "compliant": counts["C10"] == 0,
+            "detail": f"{counts['C10']} violation(s) found"
+        },
+    }
 
 
-def check_c5(repo_root: str) -> Tuple[Dict, List[Dict]]:
+def check_c5(repo_root: str, records: List[FileRecord],
+             write_violation: ViolationWriter) -> Dict:
     """
     C5: Infrastructure adapters explicitly named and isolated.
         Check: Classes under *.infrastructure.adapter.* must end with allowed suffixes.
     """
-    violations = []
+    count = 0
 
-    for jf in find_java_files(repo_root):
+    for rec in records:
         # Ignore tests
-        if is_test_path(jf):
+        if rec.is_test or not rec.is_adapter_pkg:
             continue
 
-        content = read_file(jf)
-        pkg = get_package(content)
-        if not is_adapter_package(pkg):
-            continue
-
-        classname = get_classname(jf)
+        classname = rec.classname
 
         # DTOs / payload types are often placed under adapter modules but are not adapter implementations.
         # Treat these as non-violations to avoid over-enforcement.
-        if is_dto_package(pkg) or is_dto_like_classname(classname):
+        if rec.is_dto_pkg or is_dto_like_classname(classname):
             continue
 
-        if not any(classname.endswith(s) for s in ADAPTER_SUFFIXES):
-            violations.append({
-                "constraint_id": "C5",
-                "file": str(jf),
-                "issue": f"Adapter class '{classname}' does not end with required suffix"
-            })
+        if not classname.endswith(ADAPTER_SUFFIXES):
+            write_violation("C5", str(rec.path),
+                            f"Adapter class '{classname}' does not end with required suffix")
+            count += 1
 
     return {
         "C5": {
             "constraint": "Infrastructure adapters explicitly named and isolated",
             "method": "Naming check: classes in *.infrastructure.adapter.* must use allowed suffixes",
-            "compliant": len(violations) == 0,
-            "detail": f"{len(violations)} violation(s) found"
+            "compliant": count == 0,
+            "detail": f"{count} violation(s) found"
         }
-    }, violations
+    }
 
 
-def check_c6(repo_root: str) -> Tuple[Dict, List[Dict]]:
+def check_c6(repo_root: str, records: List[FileRecord],
+             write_violation: ViolationWriter) -> Dict:
     """
     C6: Domain events use explicit event naming (Event suffix).
         Check: Classes under *.domain.event(s).* must end with 'Event'.
     """
-    violations = []
+    count = 0
 
-    for jf in find_java_files(repo_root):
-        content = read_file(jf)
-        pkg = get_package(content)
-        if not is_domain_event_package(pkg):
+    for rec in records:
+        if not rec.is_domain_event_pkg:
             continue
-        classname = get_classname(jf)
+        classname = rec.classname
         if not classname.endswith("Event"):
-            violations.append({
-                "constraint_id": "C6",
-                "file": str(jf),
-                "issue": f"Domain event class '{classname}' does not end with 'Event'"
-            })
+            write_violation("C6", str(rec.path),
+                            f"Domain event class '{classname}' does not end with 'Event'")
+            count += 1
 
     return {
         "C6": {
             "constraint": "Domain events use explicit event naming (Event suffix)",
             "method": "Naming check: classes in *.domain.event(s).* must end with 'Event'",
-            "compliant": len(violations) == 0,
-            "detail": f"{len(violations)} violation(s) found"
+            "compliant": count == 0,
+            "detail": f"{count} violation(s) found"
         }
-    }, violations
+    }
 
 
-def check_c7(repo_root: str) -> Tuple[Dict, List[Dict]]:
+def check_c7(repo_root: str, records: List[FileRecord],
+             write_violation: ViolationWriter) -> Dict:
     """
     C7: Banking service naming bounded-context aligned (BIAN suffixes).
         Check: Classes in service packages must end with allowed BIAN suffixes.
     """
-    violations = []
+    count = 0
 
-    for jf in find_java_files(repo_root):
+    for rec in records:
         # Ignore tests
-        if is_test_path(jf):
+        if rec.is_test:
             continue
 
-        content = read_file(jf)
-        pkg = get_package(content)
-
         # Scope control: in most hexagonal setups, naming conventions for *services* apply to the
         # application service layer, not to domain policies/validators/exceptions.
         if C7_ENFORCE_ONLY_APPLICATION_SERVICES:
-            if not is_application_service_package(pkg):
+            if not rec.is_app_service_pkg:
                 continue
         else:
-            if not is_service_package(pkg):
+            if not rec.is_service_pkg:
                 continue
 
-        classname = get_classname(jf)
+        classname = rec.classname
 
         # Exclude non-service concepts that may live in *service* packages (common false positives)
         if is_excluded_c7_classname(classname):
             continue
 
-        if not any(classname.endswith(s) for s in SERVICE_SUFFIXES):
-            violations.append({
-                "constraint_id": "C7",
-                "file": str(jf),
-                "issue": f"Service class '{classname}' does not end with BIAN suffix"
-            })
+        if not classname.endswith(SERVICE_SUFFIXES):
+            write_violation("C7", str(rec.path),
+                            f"Service class '{classname}' does not end with BIAN suffix")
+            count += 1
 
     return {
         "C7": {
             "constraint": "Banking service naming bounded-context aligned (BIAN suffixes)",
             "method": "Naming check: classes in service packages must use BIAN suffixes",
-            "compliant": len(violations) == 0,
-            "detail": f"{len(violations)} violation(s) found"
+            "compliant": count == 0,
+            "detail": f"{count} violation(s) found"
         }
-    }, violations
+    }
 
 
-def check_c8(repo_root: str) -> Tuple[Dict, List[Dict]]:
+def check_c8(repo_root: str, records: List[FileRecord],
+             write_violation: ViolationWriter) -> Dict:
     """
     C8: Each bounded context service must publish an OpenAPI contract.
         Check: Expected YAML files exist in api/openapi/.
     """
-    violations = []
+    missing = 0
     openapi_dir = Path(repo_root) / "api" / "openapi"
 
     existing = {f.name for f in openapi_dir.glob("*.yaml")} if openapi_dir.exists() else set()
 
     for expected in EXPECTED_OPENAPI_FILES:
         if expected not in existing:
-            violations.append({
-                "constraint_id": "C8",
-                "file": str(openapi_dir / expected),
-                "issue": f"Missing OpenAPI contract file: {expected}"
-            })
+            write_violation("C8", str(openapi_dir / expected),
+                            f"Missing OpenAPI contract file: {expected}")
+            missing += 1
 
     return {
         "C8": {
             "constraint": "Each bounded context service must publish an OpenAPI contract",
             "method": "File existence check: api/openapi/<context>.yaml",
-            "compliant": len(violations) == 0,
-            "detail": f"{len(existing)} files found; {len(violations)} missing"
+            "compliant": missing == 0,
+            "detail": f"{len(existing)} files found; {missing} missing"
         }
-    }, violations
-
-
-def check_c9(repo_root: str) -> Tuple[Dict, List[Dict]]:
-    """
-    C9: Shared libraries remain code-level only (no shared persistence).
-        Check: No persistence imports in shared-kernel or common-domain.
-    """
-    violations = []
-    patterns = [re.compile(p) for p in SHARED_KERNEL_FORBIDDEN]
-
-    for jf in find_java_files(repo_root):
-        if not is_shared_kernel(jf):
-            continue
-        content = read_file(jf)
-        imports = get_imports(content)
-        for imp in imports:
-            for pat in patterns:
-                if pat.search(imp):
-                    violations.append({
-                        "constraint_id": "C9",
-                        "file": str(jf),
-                        "issue": f"Shared kernel imports persistence: {imp}"
-                    })
-                    break
-
-    return {
-        "C9": {
-            "constraint": "Shared libraries remain code-level only (no shared persistence)",
-            "method": "Import scan: persistence imports forbidden in shared-kernel/common-domain",
-            "compliant": len(violations) == 0,
-            "detail": f"{len(violations)} violation(s) found"
-        }
-    }, violations
-
-
-def check_c10(repo_root: str) -> Tuple[Dict, List[Dict]]:
-    """
-    C10: Cross-context access via explicit OpenAPI contracts and event topics.
-         Heuristic: Flag direct imports of another bounded context's non-port package.
-    """
-    violations = []
-
-    ctx_map = {
-        "openfinance": ["com.enterprise.openfinance", "com.bank.openfinance"],
-        "payment":     ["com.bank.payment"],
-        "loan":        ["com.bank.loan"],
-        "risk":        ["com.amanahfi.risk", "com.bank.risk"],
-        "customer":    ["com.bank.customer"],
-        "compliance":  ["com.amanahfi.compliance", "com.bank.compliance"],
     }
 
-    for jf in find_java_files(repo_root):
-        content = read_file(jf)
-        pkg = get_package(content)
-        if not pkg:
-            continue
-
-        # Determine which context this file belongs to
-        own_ctx = None
-        for ctx, prefixes in ctx_map.items():
-            if any(pkg.startswith(p) for p in prefixes):
-                own_ctx = ctx
-                break
-        if own_ctx is None:
-            continue
-
-        imports = get_imports(content)
-        for imp in imports:
-            for ctx, prefixes in ctx_map.items():
-                if ctx == own_ctx:
-                    continue
-                for prefix in prefixes:
-                    if imp.startswith(prefix):
-                        # Allow port imports (cross-context via port is OK)
-                        if ".port." in imp or ".api." in imp:
-                            continue
-                        violations.append({
-                            "constraint_id": "C10",
-                            "file": str(jf),
-                            "issue": f"Direct cross-context import from '{ctx}': {imp}"
-                        })
-
-    return {
-        "C10": {
-            "constraint": "Cross-context access via explicit OpenAPI contracts and event topics",
-            "method": "Import scan: direct cross-context imports (non-port) flagged as violations",
-            "compliant": len(violations) == 0,
-            "detail": f"{len(violations)} violation(s) found"
-        }
-    }, violations
-
 
 # =========================
 # MAIN
@@ -584,6 +739,10 @@ def main():
     parser = argparse.ArgumentParser(description="RQ2 Compliance Analysis")
     parser.add_argument("--repo_root", required=True,
                         help="Root of the cloned repository")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="Worker processes for parsing Java files (0 = one per CPU, 1 = no pool)")
+    parser.add_argument("--cache", default=None,
+                        help="Optional pickle file caching parsed files between runs (incremental mode)")
     args = parser.parse_args()
 
     repo_root = args.repo_root
@@ -592,17 +751,28 @@ def main():
     detail_path  = os.path.join(out_dir, "rq2_violations_detail.csv")
 
     print(f"Repo root : {repo_root}")
-    print(f"Scanning {len(find_java_files(repo_root))} Java files...\n")
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    records = scan_repo(repo_root, jobs=jobs, cache_path=args.cache)
+    print(f"Scanning {len(records)} Java files...\n")
 
     all_results = {}
-    all_violations = []
+    violation_count = 0
+
+    # Run all checks, streaming violations to the detail CSV as they are found
+    with open(detail_path, "w", encoding="utf-8-sig", newline="",
+              buffering=CSV_WRITE_BUFFER) as f:
+        f.write("sep=,\n")
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(("constraint_id", "file", "issue"))
+
+        def write_violation(constraint_id: str, file: str, issue: str) -> None:
+            nonlocal violation_count
+            writer.writerow((constraint_id, file, issue))
+            violation_count += 1
 
-    # Run all checks
-    for check_fn in [check_c1_c2, check_c3, check_c4, check_c5,
-                     check_c6, check_c7, check_c8, check_c9, check_c10]:
-        res, viols = check_fn(repo_root)
-        all_results.update(res)
-        all_violations.extend(viols)
+        for check_fn in [check_c1, check_import_rules, check_c5,
+                         check_c6, check_c7, check_c8]:
+            all_results.update(check_fn(repo_root, records, write_violation))
 
     # Print summary
     print("=" * 60)
@@ -615,34 +785,17 @@ def main():
     print("=" * 60)
     compliant_count = sum(1 for r in all_results.values() if r["compliant"])
     print(f"Compliant: {compliant_count}/{len(all_results)}")
-    print(f"Total violations: {len(all_violations)}")
+    print(f"Total violations: {violation_count}")
 
     # Write summary CSV
     with open(summary_path, "w", encoding="utf-8-sig", newline="") as f:
         f.write("sep=,\n")
-        writer = csv.DictWriter(f, fieldnames=[
-            "constraint_id", "constraint", "method", "compliant", "detail"
-        ], quoting=csv.QUOTE_ALL)
-        writer.writeheader()
-        for cid in sorted(all_results.keys()):
-            r = all_results[cid]
-            writer.writerow({
-                "constraint_id": cid,
-                "constraint": r["constraint"],
-                "method": r["method"],
-                "compliant": "yes" if r["compliant"] else "no",
-                "detail": r["detail"]
-            })
-
-    # Write violations CSV
-    with open(detail_path, "w", encoding="utf-8-sig", newline="") as f:
-        f.write("sep=,\n")
-        writer = csv.DictWriter(f, fieldnames=[
-            "constraint_id", "file", "issue"
-        ], quoting=csv.QUOTE_ALL)
-        writer.writeheader()
-        for v in all_violations:
-            writer.writerow(v)
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(("constraint_id", "constraint", "method", "compliant", "detail"))
+        writer.writerows(
+            (cid, r["constraint"], r["method"], "yes" if r["compliant"] else "no", r["detail"])
+            for cid, r in sorted(all_results.items())
+        )
 
     print(f"\nSummary  -> {summary_path}")
     print(f"Violations -> {detail_path}")
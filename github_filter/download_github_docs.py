@@ -1,54 +1,87 @@
 """
-GitHub Documentation Downloader v0.3.0
+GitHub Documentation Downloader v0.4.0
 =====================================
 - Reads an Excel file containing a column named 'url' with GitHub repo URLs
 - Deduplicates repos by URL
-- Downloads README + documentation directories (recursive) via GitHub Contents API
+- Downloads README + documentation directories (recursive); all candidate docs
+  trees are probed with one aliased GraphQL query, falling back to the Contents API
 - Stores artifacts locally under: OUTPUT_ROOT\<repo_id>\
-- Writes repos.csv with retrieval + artifact metadata
+- Writes repos.csv with retrieval + artifact metadata (one row appended per repo)
+- Re-runs send If-None-Match with the ETags stored in OUTPUT_ROOT\.etag_cache.json,
+  so unchanged API responses and raw files come back as cheap 304s
+
+Repos, and the requests inside each repo, are fetched concurrently with
+asyncio/aiohttp; API_CONCURRENCY and RAW_CONCURRENCY bound the number of
+in-flight API calls and raw file downloads.
 
 Requirements:
-  pip install pandas requests openpyxl
+  pip install pandas aiohttp openpyxl
+  pip install orjson   (optional, faster JSON parsing)
 
 Notes:
-- GITHUB_TOKEN can be left empty (anonymous). Rate limits will be stricter.
+- GITHUB_TOKENS (env var, comma-separated) can be left empty (anonymous); rate
+  limits will be stricter. Several tokens are used round-robin.
 - Set OUTPUT_ROOT to your desired folder (Windows path supported).
 """
 
 import os
 import re
+import csv
 import time
 import json
+import asyncio
 import hashlib
+import itertools
+import tempfile
 from pathlib import Path
+from collections import deque
+from urllib.parse import quote
 from datetime import datetime, timezone
 
-import requests
+import aiohttp
 import pandas as pd
 
+try:
+    import orjson
+    json_loads = orjson.loads   # parses bytes directly, 2-5x faster than json
+except ImportError:
+    json_loads = json.loads
+
 # ─── CONFIG ───────────────────────────────────────────────────────────────────
 
 EXCEL_PATH   = "filtered_github_repos_java.csv"   # must contain a 'url' column
 OUTPUT_ROOT  = Path(r"D:\Desktop\github_filter\github_document")   # <- your target folder
 REPOS_CSV    = OUTPUT_ROOT / "repos.csv"
-
-SCRIPT_VERSION = "v0.3.0"
+REPOS_FIELDS = [
+    "repo_id", "source", "repo_url", "repo_name", "local_root",
+    "retrieval_ok", "docs_found", "readme_found", "readme_paths",
+    "docs_dir_found", "doc_paths", "doc_artifact_count",
+    "run_id", "processing_timestamp_utc", "script_version", "retrieval_error",
+]
+ETAG_CACHE_JSON = OUTPUT_ROOT / ".etag_cache.json"   # url -> {"etag", "body_path"}
+ETAG_CACHE_DIR  = OUTPUT_ROOT / ".etag_cache"        # content-addressed API response bodies
+
+SCRIPT_VERSION = "v0.4.0"
 RUN_ID         = hashlib.sha1(str(time.time()).encode()).hexdigest()[:8]
 TS_UTC         = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-# Leave empty if you want anonymous access
-GITHUB_TOKEN = "" 
+# Comma-separated in the GITHUB_TOKENS env var; leave unset for anonymous access
+GITHUB_TOKENS = [t.strip() for t in os.environ.get("GITHUB_TOKENS", "").split(",") if t.strip()]
 
 API_BASE = "https://api.github.com"
+GRAPHQL_URL = f"{API_BASE}/graphql"
+RAW_BASE = "https://raw.githubusercontent.com"
+
+# levels of nested Tree entries fetched by one GraphQL query; deeper subtrees
+# are listed through the REST Contents API
+GRAPHQL_TREE_DEPTH = 5
 
 API_HEADERS = {
     "Accept": "application/vnd.github.v3+json",
-    "User-Agent": "thesis-doc-downloader/0.3.0",
+    "User-Agent": "thesis-doc-downloader/0.4.0",
 }
-if GITHUB_TOKEN.strip():
-    API_HEADERS["Authorization"] = f"token {GITHUB_TOKEN.strip()}"
 
-RAW_HEADERS = {"User-Agent": "thesis-doc-downloader/0.3.0"}
+RAW_HEADERS = {"User-Agent": "thesis-doc-downloader/0.4.0"}
 
 # candidate doc directory names (we collect ALL that exist, not only the first)
 DOCS_DIR_CANDIDATES = ["docs", "doc", "documentation"]
@@ -63,79 +96,272 @@ TOPLEVEL_DOC_FILENAMES = {
     "DESIGN_DOC.md", "HLD.md", "OVERVIEW.md",
 }
 
-# polite delay between API calls (seconds)
-API_DELAY = 0.35
+# skip docs directories with more files than this
+MAX_DOC_FILES = 500
+
+# below this many remaining calls, requests are paced evenly until the reset
+API_LOW_REMAINING = 50
+
+# concurrency limits (in-flight API calls / raw downloads)
+API_CONCURRENCY = 10
+RAW_CONCURRENCY = 20
+
+# repos processed concurrently; bounds how far work runs ahead of repos.csv
+REPO_CONCURRENCY = 8
+
+API_TIMEOUT = aiohttp.ClientTimeout(total=20)
+RAW_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# raw downloads are streamed to disk in chunks of this size
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# created by main() inside the running loop (before 3.10, asyncio primitives
+# built at import time bind to a different loop than the one asyncio.run starts)
+API_SEMAPHORE = None
+RAW_SEMAPHORE = None
+
+# url -> {"etag": ..., "body_path": ..., "save_path": ...}; loaded/flushed by main()
+ETAG_CACHE = {}
+
+# ─── RATE LIMITING ────────────────────────────────────────────────────────────
+
+class RateLimiter:
+    """
+    Rate-limit budget of one token for one resource (core / graphql), updated
+    from the X-RateLimit-* headers of every response. acquire() returns at once
+    while the budget is healthy; below API_LOW_REMAINING it spaces calls
+    (reset_in / remaining) apart so the budget lasts until the reset.
+    """
+
+    def __init__(self):
+        self.remaining = None
+        self.reset_ts = 0
+        self._next_ts = 0.0
+
+    def update(self, headers):
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining and remaining.isdigit() and reset and reset.isdigit():
+            self.remaining = int(remaining)
+            self.reset_ts = int(reset)
+
+    def exhausted(self, now: float) -> bool:
+        return self.remaining == 0 and self.reset_ts > now
+
+    async def acquire(self):
+        now = time.time()
+        if self.remaining is None or self.remaining >= API_LOW_REMAINING or self.reset_ts <= now:
+            return
+        interval = (self.reset_ts - now) / max(self.remaining, 1)
+        # Reserve the next slot before sleeping so concurrent callers queue up behind it
+        start = max(now, self._next_ts)
+        self._next_ts = start + interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+# (token, rate-limit resource) -> RateLimiter; token is None when anonymous
+LIMITERS = {}
+_TOKEN_CYCLE = itertools.cycle(GITHUB_TOKENS)
+
+def get_limiter(token, resource: str = "core") -> RateLimiter:
+    limiter = LIMITERS.get((token, resource))
+    if limiter is None:
+        limiter = LIMITERS[(token, resource)] = RateLimiter()
+    return limiter
 
 # ─── HELPERS ──────────────────────────────────────────────────────────────────
 
+def _token_usable(token: str, resource: str, now: float) -> bool:
+    limiter = LIMITERS.get((token, resource))
+    return limiter is None or not limiter.exhausted(now)
+
+def next_token(resource: str = "core"):
+    """
+    Next token in round-robin order, skipping tokens whose `resource` budget is
+    exhausted until their reset time. Returns None when running anonymously.
+    No await happens in here, so concurrent tasks can't interleave a selection.
+    """
+    if not GITHUB_TOKENS:
+        return None
+    now = time.time()
+    for _ in range(len(GITHUB_TOKENS)):
+        token = next(_TOKEN_CYCLE)
+        if _token_usable(token, resource, now):
+            return token
+    # every token is exhausted: use the one that resets first
+    return min(GITHUB_TOKENS, key=lambda t: LIMITERS[(t, resource)].reset_ts)
+
+def has_spare_token(resource: str = "core") -> bool:
+    now = time.time()
+    return any(_token_usable(t, resource, now) for t in GITHUB_TOKENS)
+
+def update_token_state(token, headers):
+    get_limiter(token, headers.get("X-RateLimit-Resource", "core")).update(headers)
+
+def auth_headers(token) -> dict:
+    if token is None:
+        return dict(API_HEADERS)
+    return {**API_HEADERS, "Authorization": f"token {token}"}
+
+def load_etag_cache():
+    try:
+        with open(ETAG_CACHE_JSON, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if isinstance(data, dict):
+            ETAG_CACHE.update(data)
+    except (OSError, ValueError):
+        pass
+
+def save_etag_cache():
+    tmp = ETAG_CACHE_JSON.with_name(ETAG_CACHE_JSON.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(ETAG_CACHE, fh)
+    os.replace(tmp, ETAG_CACHE_JSON)
+
+def load_cached_body(url: str):
+    entry = ETAG_CACHE.get(url)
+    if not entry or not entry.get("body_path"):
+        return None
+    try:
+        return json_loads(Path(entry["body_path"]).read_bytes())
+    except (OSError, ValueError):
+        return None
+
+def store_cached_body(url: str, etag: str, body: bytes):
+    body_path = ETAG_CACHE_DIR / (hashlib.sha1(body).hexdigest() + ".json")
+    if not body_path.exists():
+        ETAG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        body_path.write_bytes(body)
+    ETAG_CACHE[url] = {"etag": etag, "body_path": str(body_path)}
+
+GITHUB_REPO_RE = r"^https?://github\.com/([^/]+)/([^/]+)"
+
 def parse_owner_repo(url: str):
     url = (url or "").strip().rstrip("/")
-    m = re.match(r"https?://github\.com/([^/]+)/([^/]+)", url)
+    m = re.match(GITHUB_REPO_RE, url)
     if not m:
         return None, None
     return m.group(1), m.group(2)
 
-def safe_request_get(url: str):
+async def _api_get(session: aiohttp.ClientSession, url: str):
+    token = next_token()
+    await get_limiter(token).acquire()
+    headers = auth_headers(token)
+    entry = ETAG_CACHE.get(url)
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+
+    async with session.get(url, headers=headers, timeout=API_TIMEOUT) as r:
+        update_token_state(token, r.headers)
+        status = r.status
+        data = None
+        if status == 304:
+            # Unchanged since last run: serve the stored body (costs no rate limit)
+            data = load_cached_body(url)
+            if data is not None:
+                return 200, r.headers.get("X-RateLimit-Reset"), r.headers.get("X-RateLimit-Remaining"), data
+        elif status == 200:
+            body = await r.read()
+            try:
+                data = json_loads(body)
+            except ValueError:
+                data = None
+            etag = r.headers.get("ETag")
+            if etag and data is not None:
+                store_cached_body(url, etag, body)
+        if status != 304:
+            return status, r.headers.get("X-RateLimit-Reset"), r.headers.get("X-RateLimit-Remaining"), data
+
+    # 304 but the stored body is missing or unreadable: forget the ETag and fetch afresh
+    ETAG_CACHE.pop(url, None)
+    return await _api_get(session, url)
+
+async def safe_request_get(session: aiohttp.ClientSession, url: str):
     """
     GET request with basic rate-limit handling.
     If rate-limited, waits until reset (if provided) or 60s fallback.
+    Returns (status, json_data, error); json_data is None unless status is 200.
     """
     try:
-        r = requests.get(url, headers=API_HEADERS, timeout=20)
-    except requests.RequestException as e:
-        return None, f"request_error: {e}"
-
-    # Handle rate limit
-    if r.status_code in (403, 429):
-        reset = r.headers.get("X-RateLimit-Reset")
-        remaining = r.headers.get("X-RateLimit-Remaining")
-        # If GitHub tells us when it resets, wait until then (+2s)
-        if reset and (remaining == "0" or remaining is None):
-            try:
-                reset_ts = int(reset)
-                now_ts = int(time.time())
-                wait_s = max(0, reset_ts - now_ts) + 2
-                print(f"  [RATE LIMIT] sleeping {wait_s}s until reset...")
-                time.sleep(wait_s)
-                r = requests.get(url, headers=API_HEADERS, timeout=20)
-            except Exception:
+        async with API_SEMAPHORE:
+            status, reset, remaining, data = await _api_get(session, url)
+
+            # Another token still has budget: switch to it instead of waiting
+            if status in (403, 429) and remaining == "0" and has_spare_token():
+                status, reset, remaining, data = await _api_get(session, url)
+
+        # Handle rate limit; the wait happens outside the semaphore so other
+        # requests (e.g. on a token with budget left) are not blocked by it
+        if status in (403, 429):
+            # If GitHub tells us when it resets, wait until then (+2s)
+            if reset and (remaining == "0" or remaining is None):
+                try:
+                    wait_s = max(0, int(reset) - int(time.time())) + 2
+                    print(f"  [RATE LIMIT] sleeping {wait_s}s until reset...")
+                except ValueError:
+                    wait_s = 60
+                    print("  [RATE LIMIT] sleeping 60s (fallback)...")
+            else:
+                wait_s = 60
                 print("  [RATE LIMIT] sleeping 60s (fallback)...")
-                time.sleep(60)
-                r = requests.get(url, headers=API_HEADERS, timeout=20)
-        else:
-            print("  [RATE LIMIT] sleeping 60s (fallback)...")
-            time.sleep(60)
-            r = requests.get(url, headers=API_HEADERS, timeout=20)
-
-    return r, None
-
-def download_raw_file(raw_url: str, save_path: Path) -> bool:
-    try:
-        r = requests.get(raw_url, headers=RAW_HEADERS, timeout=30)
-        if r.status_code == 200:
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            save_path.write_bytes(r.content)
-            return True
-    except requests.RequestException:
-        pass
+            await asyncio.sleep(wait_s)
+            async with API_SEMAPHORE:
+                status, reset, remaining, data = await _api_get(session, url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return None, None, f"request_error: {e!r}"
+
+    return status, data, None
+
+async def download_raw_file(session: aiohttp.ClientSession, raw_url: str, save_path: Path) -> bool:
+    headers = RAW_HEADERS
+    entry = ETAG_CACHE.get(raw_url)
+    # Only revalidate when the previous copy is still on disk at the same path
+    # (repo ids follow CSV row order, so a reordered input reuses paths)
+    if entry and entry.get("etag") and entry.get("save_path") == str(save_path) and save_path.exists():
+        headers = {**RAW_HEADERS, "If-None-Match": entry["etag"]}
+
+    async with RAW_SEMAPHORE:
+        try:
+            async with session.get(raw_url, headers=headers, timeout=RAW_TIMEOUT) as r:
+                if r.status == 304:
+                    return True
+                if r.status == 200:
+                    # Stream into a temp file next to the target, then swap it in,
+                    # so memory stays bounded and a failed download never leaves a partial file
+                    save_path.parent.mkdir(parents=True, exist_ok=True)
+                    fd, tmp_path = tempfile.mkstemp(dir=save_path.parent, suffix=".part")
+                    try:
+                        with os.fdopen(fd, "wb") as fh:
+                            async for chunk in r.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                                fh.write(chunk)
+                        os.replace(tmp_path, save_path)
+                    except BaseException:
+                        os.unlink(tmp_path)
+                        raise
+                    etag = r.headers.get("ETag")
+                    if etag:
+                        ETAG_CACHE[raw_url] = {"etag": etag, "body_path": "", "save_path": str(save_path)}
+                    return True
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
     return False
 
-def list_dir_recursive(owner: str, repo: str, path: str):
+async def list_dir_recursive(session: aiohttp.ClientSession, owner: str, repo: str, path: str):
     """
     Recursively list files under a directory using GitHub Contents API.
-    Returns list of dicts for files.
+    Subdirectories are listed concurrently. Returns list of dicts for files.
     """
     url = f"{API_BASE}/repos/{owner}/{repo}/contents/{path}"
-    r, err = safe_request_get(url)
-    time.sleep(API_DELAY)
+    status, data, err = await safe_request_get(session, url)
 
-    if not r or r.status_code != 200:
+    if status != 200 or not isinstance(data, list):
         return []
 
-    data = r.json()
-    if not isinstance(data, list):
-        return []
+    subdirs = [item.get("path", "") for item in data if item.get("type") == "dir" and item.get("path")]
+    listings = dict(zip(subdirs, await asyncio.gather(
+        *(list_dir_recursive(session, owner, repo, p) for p in subdirs))))
 
+    # Splice subdirectory listings in place to keep the depth-first order
     out = []
     for item in data:
         t = item.get("type")
@@ -144,29 +370,281 @@ def list_dir_recursive(owner: str, repo: str, path: str):
         elif t == "dir":
             subpath = item.get("path", "")
             if subpath:
-                out.extend(list_dir_recursive(owner, repo, subpath))
+                out.extend(listings[subpath])
     return out
 
-def get_repo_accessible(owner: str, repo: str):
-    r, err = safe_request_get(f"{API_BASE}/repos/{owner}/{repo}")
-    time.sleep(API_DELAY)
-    if not r:
+def _tree_selection(depth: int) -> str:
+    if depth <= 1:
+        return "entries { name path type }"
+    return "entries { name path type object { ... on Tree { " + _tree_selection(depth - 1) + " } } }"
+
+def graphql_docs_query(dirs) -> str:
+    """One aliased object() per directory name: d0, d1, ..."""
+    return (
+        "query($owner: String!, $name: String!) { "
+        "repository(owner: $owner, name: $name) { "
+        + " ".join(
+            f"d{i}: object(expression: {json.dumps('HEAD:' + d)}) "
+            "{ ... on Tree { " + _tree_selection(GRAPHQL_TREE_DEPTH) + " } }"
+            for i, d in enumerate(dirs)
+        )
+        + " } }"
+    )
+
+async def graphql_query(session: aiohttp.ClientSession, query: str, variables: dict):
+    """
+    POST a GraphQL query. Returns the "data" object, or None on any error
+    (GraphQL needs a token, so anonymous runs always get None).
+    """
+    if not GITHUB_TOKENS:
+        return None
+    async with API_SEMAPHORE:
+        token = next_token("graphql")
+        await get_limiter(token, "graphql").acquire()
+        try:
+            async with session.post(GRAPHQL_URL, headers=auth_headers(token), timeout=API_TIMEOUT,
+                                    json={"query": query, "variables": variables}) as r:
+                update_token_state(token, r.headers)
+                if r.status != 200:
+                    return None
+                payload = json_loads(await r.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return None
+    if not isinstance(payload, dict) or payload.get("errors"):
+        return None
+    return payload.get("data")
+
+def _flatten_tree(owner: str, repo: str, entries, out: list, truncated: list):
+    """
+    Convert GraphQL tree entries into the Contents API file dict shape.
+    Trees whose entries were not fetched (depth limit) are left in `out` as
+    their path string and collected in `truncated`.
+    """
+    for e in entries:
+        t = e.get("type")
+        path = e.get("path", "")
+        if t == "blob":
+            out.append({
+                "name": e.get("name", ""),
+                "path": path,
+                "type": "file",
+                "download_url": f"{RAW_BASE}/{owner}/{repo}/HEAD/{quote(path)}",
+            })
+        elif t == "tree":
+            sub = e.get("object")
+            if sub and "entries" in sub:
+                _flatten_tree(owner, repo, sub["entries"], out, truncated)
+            elif path:
+                out.append(path)
+                truncated.append(path)
+
+async def _expand_tree(session: aiohttp.ClientSession, owner: str, repo: str, tree):
+    """
+    Flatten a GraphQL Tree object into the same file dicts as list_dir_recursive.
+    A missing directory (null object) yields [].
+    """
+    if not tree or "entries" not in tree:
+        return []
+
+    out = []
+    truncated = []
+    _flatten_tree(owner, repo, tree["entries"], out, truncated)
+    if not truncated:
+        return out
+
+    listings = dict(zip(truncated, await asyncio.gather(
+        *(list_dir_recursive(session, owner, repo, p) for p in truncated))))
+    files = []
+    for f in out:
+        if isinstance(f, str):
+            files.extend(listings[f])
+        else:
+            files.append(f)
+    return files
+
+async def graphql_probe_docs(session: aiohttp.ClientSession, owner: str, repo: str, dirs):
+    """
+    Probe the given docs directories with a single aliased GraphQL query.
+    Returns {dir_name: [file dicts]} ([] for absent dirs); falls back to one
+    Contents API walk per directory if the query fails.
+    """
+    if not dirs:
+        return {}
+    data = await graphql_query(session, graphql_docs_query(dirs), {"owner": owner, "name": repo})
+    if data is None:
+        listings = await asyncio.gather(
+            *(list_dir_recursive(session, owner, repo, d) for d in dirs))
+    else:
+        repo_obj = data.get("repository") or {}
+        listings = await asyncio.gather(
+            *(_expand_tree(session, owner, repo, repo_obj.get(f"d{i}")) for i in range(len(dirs))))
+    return dict(zip(dirs, listings))
+
+async def get_repo_accessible(session: aiohttp.ClientSession, owner: str, repo: str):
+    status, data, err = await safe_request_get(session, f"{API_BASE}/repos/{owner}/{repo}")
+    if status is None:
         return False, err or "unknown_error", None
-    if r.status_code != 200:
-        return False, f"http_{r.status_code}", None
-    try:
-        return True, None, r.json()
-    except Exception:
-        return True, None, None
+    if status != 200:
+        return False, f"http_{status}", None
+    return True, None, data
+
+async def download_all(session: aiohttp.ClientSession, targets):
+    """Download (raw_url, save_path) pairs concurrently; returns saved paths in input order."""
+    oks = await asyncio.gather(*(download_raw_file(session, url, p) for url, p in targets))
+    return [p for (_, p), ok in zip(targets, oks) if ok]
+
+# ─── PER-REPO ─────────────────────────────────────────────────────────────────
+async def process_repo(session: aiohttp.ClientSession, i: int, n: int, url: str, repo_id: str, owner: str, repo: str):
+    owner = owner or None
+
+    # Log lines are buffered and printed together so concurrent repos don't interleave
+    log = [f"[{i+1}/{n}] {repo_id} — {owner}/{repo}" if owner else f"[{i+1}/{n}] {repo_id} — (bad url)"]
+
+    record = {
+        "repo_id": repo_id,
+        "source": "github",
+        "repo_url": url,
+        "repo_name": f"{owner}/{repo}" if owner else "",
+        "local_root": str((OUTPUT_ROOT / repo_id).resolve()),
+        "retrieval_ok": 0,
+        "docs_found": 0,
+        "readme_found": 0,
+        "readme_paths": "",
+        "docs_dir_found": 0,
+        "doc_paths": "",
+        "doc_artifact_count": 0,
+        "run_id": RUN_ID,
+        "processing_timestamp_utc": TS_UTC,
+        "script_version": SCRIPT_VERSION,
+        "retrieval_error": "",
+    }
+
+    if not owner:
+        record["retrieval_error"] = "unparseable_url"
+        log.append("  [SKIP] Could not parse GitHub URL\n")
+        print("\n".join(log))
+        return record
+
+    ok, err, repo_meta = await get_repo_accessible(session, owner, repo)
+    if not ok:
+        record["retrieval_error"] = err or "repo_not_accessible"
+        log.append(f"  [FAIL] Repo not accessible: {record['retrieval_error']}\n")
+        print("\n".join(log))
+        return record
+
+    record["retrieval_ok"] = 1
+    repo_dir = OUTPUT_ROOT / repo_id
+
+    readme_paths = []
+    doc_paths = []
+
+    # README and root listing are independent: fetch them concurrently
+    (readme_status, readme_data, _), (root_status, items, _) = await asyncio.gather(
+        safe_request_get(session, f"{API_BASE}/repos/{owner}/{repo}/readme"),
+        safe_request_get(session, f"{API_BASE}/repos/{owner}/{repo}/contents/"),
+    )
+    root_ok = root_status == 200 and isinstance(items, list)
+
+    # Only probe docs dirs the root listing actually contains (all of them if it failed)
+    if root_ok:
+        root_dirs = {it.get("name") for it in items if it.get("type") == "dir"}
+        probe_dirs = [d for d in DOCS_DIR_CANDIDATES if d in root_dirs]
+    else:
+        probe_dirs = DOCS_DIR_CANDIDATES
+    dirs = await graphql_probe_docs(session, owner, repo, probe_dirs)
+
+    # A) README
+    readme_task = None
+    if readme_status == 200 and isinstance(readme_data, dict):
+        raw_url = readme_data.get("download_url", "")
+        fname = readme_data.get("name", "README.md")
+        if raw_url:
+            readme_task = (raw_url, repo_dir / fname)
+    else:
+        log.append("  ✗ No README found")
+
+    # B) Top-level architecture/design docs
+    toplevel_targets = []
+    if root_ok:
+        by_name = {it.get("name"): it for it in items if it.get("type") == "file"}
+        for name in TOPLEVEL_DOC_FILENAMES:
+            it = by_name.get(name)
+            if it and it.get("download_url"):
+                toplevel_targets.append((it["download_url"], repo_dir / name))
+
+    # C) Docs directories
+    found_any_docs_dir = False
+    docs_targets = []
+
+    for d in DOCS_DIR_CANDIDATES:
+        files = dirs.get(d)
+        if not files:
+            continue
+
+        if len(files) > MAX_DOC_FILES:
+            log.append(f"  ⚠ Skipping /{d} (too large: {len(files)} files)")
+            record["retrieval_error"] = f"docs_dir_too_large_{len(files)}"
+            continue
+
+        found_any_docs_dir = True
+        log.append(f"  ✓ /{d} — {len(files)} files (recursive)")
+
+        for f in files:
+            fname = f.get("name", "")
+            raw_url = f.get("download_url", "")
+            if not raw_url:
+                continue
+
+            ext = Path(fname).suffix.lower()
+            if ext not in DOCS_EXTENSIONS:
+                continue
+
+            rel_path = f.get("path", fname)
+            docs_targets.append((raw_url, repo_dir / rel_path))
+
+    saved_readme, saved_toplevel, saved_docs = await asyncio.gather(
+        download_all(session, [readme_task] if readme_task else []),
+        download_all(session, toplevel_targets),
+        download_all(session, docs_targets),
+    )
+
+    if saved_readme:
+        record["readme_found"] = 1
+        readme_paths.append(str(saved_readme[0]))
+        log.append(f"  ✓ README: {saved_readme[0].name}")
+    for p in saved_toplevel:
+        doc_paths.append(str(p))
+        log.append(f"  ✓ Top-level doc: {p.name}")
+    doc_paths.extend(str(p) for p in saved_docs)
+
+    if found_any_docs_dir:
+        record["docs_dir_found"] = 1
+
+    # Finalize
+    record["readme_paths"] = ";".join(readme_paths)
+    record["doc_paths"] = ";".join(doc_paths)
+    record["doc_artifact_count"] = len(readme_paths) + len(doc_paths)
+    record["docs_found"] = 1 if record["doc_artifact_count"] > 0 else 0
+
+    log.append(f"  → docs_found={record['docs_found']}, artifacts={record['doc_artifact_count']}\n")
+    print("\n".join(log))
+    return record
 
 # ─── MAIN ─────────────────────────────────────────────────────────────────────
-def main():
+async def main():
+    global API_SEMAPHORE, RAW_SEMAPHORE
+    API_SEMAPHORE = asyncio.Semaphore(API_CONCURRENCY)
+    RAW_SEMAPHORE = asyncio.Semaphore(RAW_CONCURRENCY)
+
     OUTPUT_ROOT.mkdir(parents=True, exist_ok=True)
+    load_etag_cache()
 
     print(f"Output root:      {OUTPUT_ROOT}")
     print(f"Run ID:           {RUN_ID}")
     print(f"Timestamp (UTC):  {TS_UTC}")
     print(f"Script version:   {SCRIPT_VERSION}")
+    print(f"ETag cache:       {len(ETAG_CACHE)} entries")
+    print(f"GitHub tokens:    {len(GITHUB_TOKENS) or 'none (anonymous)'}")
     print()
 
     print(f"Loading CSV: {EXCEL_PATH}")
@@ -184,147 +662,60 @@ def main():
     df = df.drop_duplicates(subset=["url"]).reset_index(drop=True)
     print(f"Deduplicated: {before} → {len(df)} unique repos\n")
 
-    df["repo_id"] = [f"gh_{str(i+1).zfill(3)}" for i in range(len(df))]
-
-    rows = []
-
-    for i, row in df.iterrows():
-        url = str(row["url"]).strip()
-        owner, repo = parse_owner_repo(url)
-        repo_id = row["repo_id"]
-
-        print(f"[{i+1}/{len(df)}] {repo_id} — {owner}/{repo}" if owner else f"[{i+1}/{len(df)}] {repo_id} — (bad url)")
-
-        record = {
-            "repo_id": repo_id,
-            "source": "github",
-            "repo_url": url,
-            "repo_name": f"{owner}/{repo}" if owner else "",
-            "local_root": str((OUTPUT_ROOT / repo_id).resolve()),
-            "retrieval_ok": 0,
-            "docs_found": 0,
-            "readme_found": 0,
-            "readme_paths": "",
-            "docs_dir_found": 0,
-            "doc_paths": "",
-            "doc_artifact_count": 0,
-            "run_id": RUN_ID,
-            "processing_timestamp_utc": TS_UTC,
-            "script_version": SCRIPT_VERSION,
-            "retrieval_error": "",
-        }
-
-        if not owner:
-            record["retrieval_error"] = "unparseable_url"
-            rows.append(record)
-            print("  [SKIP] Could not parse GitHub URL\n")
-            continue
-
-        ok, err, repo_meta = get_repo_accessible(owner, repo)
-        if not ok:
-            record["retrieval_error"] = err or "repo_not_accessible"
-            rows.append(record)
-            print(f"  [FAIL] Repo not accessible: {record['retrieval_error']}\n")
-            continue
-
-        record["retrieval_ok"] = 1
-        repo_dir = OUTPUT_ROOT / repo_id
-
-        readme_paths = []
-        doc_paths = []
-
-        # A) README
-        r, _ = safe_request_get(f"{API_BASE}/repos/{owner}/{repo}/readme")
-        time.sleep(API_DELAY)
-        if r and r.status_code == 200:
-            data = r.json()
-            raw_url = data.get("download_url", "")
-            fname = data.get("name", "README.md")
-            save_path = repo_dir / fname
-            if raw_url and download_raw_file(raw_url, save_path):
-                record["readme_found"] = 1
-                readme_paths.append(str(save_path))
-                print(f"  ✓ README: {fname}")
-        else:
-            print("  ✗ No README found")
-
-        # B) Top-level architecture/design docs
-        root_listing, _ = safe_request_get(f"{API_BASE}/repos/{owner}/{repo}/contents/")
-        time.sleep(API_DELAY)
-        if root_listing and root_listing.status_code == 200:
-            try:
-                items = root_listing.json()
-                if isinstance(items, list):
-                    by_name = {it.get("name"): it for it in items if it.get("type") == "file"}
-                    for name in TOPLEVEL_DOC_FILENAMES:
-                        it = by_name.get(name)
-                        if it and it.get("download_url"):
-                            save_path = repo_dir / name
-                            if download_raw_file(it["download_url"], save_path):
-                                doc_paths.append(str(save_path))
-                                print(f"  ✓ Top-level doc: {name}")
-            except Exception:
-                pass
-
-                # C) Docs directories
-        found_any_docs_dir = False
-        MAX_DOC_FILES = 500
-
-        for d in DOCS_DIR_CANDIDATES:
-            files = list_dir_recursive(owner, repo, d)
-
-            if not files:
-                continue
-
-            if len(files) > MAX_DOC_FILES:
-                print(f"  ⚠ Skipping /{d} (too large: {len(files)} files)")
-                record["retrieval_error"] = f"docs_dir_too_large_{len(files)}"
-                continue
-
-            found_any_docs_dir = True
-            print(f"  ✓ /{d} — {len(files)} files (recursive)")
-
-            for f in files:
-                fname = f.get("name", "")
-                raw_url = f.get("download_url", "")
-                if not raw_url:
-                    continue
+    df["repo_id"] = "gh_" + pd.Series(range(1, len(df) + 1), index=df.index).astype(str).str.zfill(3)
 
-                ext = Path(fname).suffix.lower()
-                if ext not in DOCS_EXTENSIONS:
-                    continue
+    # Parse owner/repo for the whole column at once ("" where the URL doesn't match)
+    df["url"] = df["url"].astype(str).str.strip()
+    owners_repos = df["url"].str.rstrip("/").str.extract(GITHUB_REPO_RE, expand=True).fillna("")
+    df["owner"], df["repo"] = owners_repos[0], owners_repos[1]
 
-                rel_path = f.get("path", fname)
-                save_path = repo_dir / rel_path
+    connector = aiohttp.TCPConnector(limit=API_CONCURRENCY + RAW_CONCURRENCY, keepalive_timeout=30)
+    n_rows = retrieval_ok_n = docs_found_n = readme_found_n = docs_dir_found_n = 0
 
-                if download_raw_file(raw_url, save_path):
-                    doc_paths.append(str(save_path))
+    # Rows are appended and flushed as repos finish, so a crash keeps everything written so far
+    with open(REPOS_CSV, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=REPOS_FIELDS, lineterminator=os.linesep)
+        writer.writeheader()
 
-        
+        async with aiohttp.ClientSession(connector=connector) as session:
+            # Sliding window of REPO_CONCURRENCY repos; awaiting the head keeps
+            # repos.csv in input order while later repos are already running
+            records = enumerate(df.itertuples(index=False))
+            window = deque()
 
-        if found_any_docs_dir:
-            record["docs_dir_found"] = 1
+            def start_repos(n):
+                for i, rec in itertools.islice(records, n):
+                    window.append(asyncio.ensure_future(
+                        process_repo(session, i, len(df), rec.url, rec.repo_id, rec.owner, rec.repo)))
 
-        # Finalize
-        record["readme_paths"] = ";".join(readme_paths)
-        record["doc_paths"] = ";".join(doc_paths)
-        record["doc_artifact_count"] = len(readme_paths) + len(doc_paths)
-        record["docs_found"] = 1 if record["doc_artifact_count"] > 0 else 0
-
-        print(f"  → docs_found={record['docs_found']}, artifacts={record['doc_artifact_count']}\n")
-        rows.append(record)
-
-    out = pd.DataFrame(rows)
-    out.to_csv(REPOS_CSV, index=False, encoding="utf-8")
-
-    print(f"✓ Saved: {REPOS_CSV} ({len(out)} rows)")
+            try:
+                start_repos(REPO_CONCURRENCY)
+                while window:
+                    record = await window.popleft()
+                    start_repos(1)
+
+                    writer.writerow(record)
+                    fh.flush()
+
+                    n_rows += 1
+                    retrieval_ok_n += record["retrieval_ok"]
+                    docs_found_n += record["docs_found"]
+                    readme_found_n += record["readme_found"]
+                    docs_dir_found_n += record["docs_dir_found"]
+            finally:
+                for task in window:
+                    task.cancel()
+                # Keep the ETags gathered so far even if the run is aborted
+                save_etag_cache()
+
+    print(f"✓ Saved: {REPOS_CSV} ({n_rows} rows)")
     print("\n── Summary ─────────────────────────────")
-    print(f"Total repos processed : {len(out)}")
-    print(f"retrieval_ok = 1      : {int(out['retrieval_ok'].sum())}")
-    print(f"docs_found = 1        : {int(out['docs_found'].sum())}")
-    print(f"readme_found = 1      : {int(out['readme_found'].sum())}")
-    print(f"docs_dir_found = 1    : {int(out['docs_dir_found'].sum())}")
+    print(f"Total repos processed : {n_rows}")
+    print(f"retrieval_ok = 1      : {retrieval_ok_n}")
+    print(f"docs_found = 1        : {docs_found_n}")
+    print(f"readme_found = 1      : {readme_found_n}")
+    print(f"docs_dir_found = 1    : {docs_dir_found_n}")
     print(f"\nRun ID: {RUN_ID} | {TS_UTC} | {SCRIPT_VERSION}")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,24 +1,118 @@
+import os
+import time
+import itertools
+import json
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+    json_loads = orjson.loads   # parses response bytes directly, faster than json
+except ImportError:
+    json_loads = json.loads
+
 # ==============================
 # CONFIGURATION
 # ==============================
 
 GITHUB_TOKEN = "..................."
 
+# Several tokens (comma-separated GITHUB_TOKENS env var) are used round-robin
+GITHUB_TOKENS = [t.strip() for t in os.environ.get("GITHUB_TOKENS", GITHUB_TOKEN).split(",") if t.strip()]
+
 HEADERS = {
-    "Authorization": f"token {GITHUB_TOKEN}",
     "Accept": "application/vnd.github+json"
 }
 
 # Java-only search
 SEARCH_QUERY = "architecture OR design OR layer in:readme language:Java"
-SEARCH_URL = "https://api.github.com/search/repositories"
+GRAPHQL_URL = "https://api.github.com/graphql"
+PER_PAGE = 30
+
+# Common README names probed inside the search query (aliases r0, r1, ...);
+# repos matching none of them fall back to the REST /readme endpoint
+README_NAMES = ["README.md", "README.rst", "README.txt", "README", "readme.md", "Readme.md", "README.markdown", "README.adoc"]
+
+SEARCH_GRAPHQL = """
+query($q: String!, $first: Int!, $after: String) {
+  search(query: $q, type: REPOSITORY, first: $first, after: $after) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on Repository {
+        nameWithOwner url updatedAt isFork hasWikiEnabled
+        primaryLanguage { name }
+        %s
+      }
+    }
+  }
+}
+""" % " ".join(f'r{i}: object(expression: "HEAD:{name}") {{ __typename }}' for i, name in enumerate(README_NAMES))
 
 ONE_YEAR_AGO = datetime.utcnow() - timedelta(days=365)
 
+# One pooled keep-alive session for all API calls; transient 5xx errors are retried
+# (POST included, since GraphQL search queries are read-only). Once retries run out
+# the last 5xx response is returned rather than raised, so the status checks below
+# skip the repo / stop paging and the CSV is still written.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=frozenset({"GET", "POST"}), raise_on_status=False),
+))
+
+# ==============================
+# TOKEN ROTATION
+# ==============================
+
+# (token, rate-limit resource) -> (remaining, reset_ts)
+TOKEN_STATE = {}
+TOKEN_CYCLE = itertools.cycle(GITHUB_TOKENS)
+
+
+def token_usable(token, resource, now):
+    remaining, reset_ts = TOKEN_STATE.get((token, resource), (None, 0))
+    return remaining != 0 or reset_ts <= now
+
+
+def next_token(resource):
+    """Next token in round-robin order, skipping tokens exhausted for this resource."""
+    if not GITHUB_TOKENS:
+        return None
+    now = time.time()
+    for _ in range(len(GITHUB_TOKENS)):
+        token = next(TOKEN_CYCLE)
+        if token_usable(token, resource, now):
+            return token
+    return min(GITHUB_TOKENS, key=lambda t: TOKEN_STATE[(t, resource)][1])
+
+
+def github_get(url, resource="core", params=None, json_body=None):
+    """GET (or POST json_body) with the next available token; moves on to another token if one runs dry."""
+    for _ in range(max(1, len(GITHUB_TOKENS))):
+        token = next_token(resource)
+        headers = dict(HEADERS)
+        if token:
+            headers["Authorization"] = f"token {token}"
+        if json_body is None:
+            response = SESSION.get(url, headers=headers, params=params)
+        else:
+            response = SESSION.post(url, headers=headers, json=json_body)
+
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if token and remaining and remaining.isdigit() and reset and reset.isdigit():
+            TOKEN_STATE[(token, response.headers.get("X-RateLimit-Resource", resource))] = (int(remaining), int(reset))
+
+        if response.status_code in (403, 429) and remaining == "0":
+            continue
+        return response
+    return response
+
 # ==============================
 # DATA COLLECTION
 # ==============================
@@ -26,6 +120,7 @@ ONE_YEAR_AGO = datetime.utcnow() - timedelta(days=365)
 results = []
 page = 1
 MAX_PAGES = 7
+cursor = None
 
 print("Starting GitHub Java-only repository filtering...")
 print("-----------------------------------------------")
@@ -33,73 +128,80 @@ print("-----------------------------------------------")
 while page <= MAX_PAGES:
     print(f"Processing page {page}...")
 
-    params = {
-        "q": SEARCH_QUERY,
-        "sort": "updated",
-        "order": "desc",
-        "per_page": 30,
-        "page": page
-    }
+    # One GraphQL search page returns every gate except the contributor count
+    variables = {"q": f"{SEARCH_QUERY} sort:updated-desc", "first": PER_PAGE, "after": cursor}
+    response = github_get(GRAPHQL_URL, resource="graphql", json_body={"query": SEARCH_GRAPHQL, "variables": variables})
 
-    response = requests.get(SEARCH_URL, headers=HEADERS, params=params)
-
-    if response.status_code != 200:
-        print("GitHub API error:", response.status_code)
+    payload = json_loads(response.content) if response.status_code == 200 else {}
+    search = (payload.get("data") or {}).get("search")
+    if response.status_code != 200 or search is None:
+        print("GitHub API error:", response.status_code, payload.get("errors", ""))
         break
 
-    items = response.json().get("items", [])
+    # Partial errors (e.g. a failed README probe) leave those fields null;
+    # the page itself is still usable, and null probes fall back to REST below
+    if payload.get("errors"):
+        print("  GitHub API partial errors:", payload["errors"])
+
+    items = [node for node in search["nodes"] if node]
     print(f"  Repositories fetched: {len(items)}")
 
     for repo in items:
 
         # Skip forks
-        if repo.get("fork", True):
+        if repo.get("isFork", True):
             continue
 
         # Ensure primary language is Java
-        if repo.get("language") != "Java":
+        language = (repo.get("primaryLanguage") or {}).get("name")
+        if language != "Java":
             continue
 
         # Skip old repositories
-        updated_at = datetime.strptime(repo["updated_at"], "%Y-%m-%dT%H:%M:%SZ")
+        updated_at = datetime.strptime(repo["updatedAt"], "%Y-%m-%dT%H:%M:%SZ")
         if updated_at < ONE_YEAR_AGO:
             continue
 
-        # Check contributors (at least 2)
-        contributors_url = f"https://api.github.com/repos/{repo['full_name']}/contributors?per_page=2"
-        contributors_resp = requests.get(contributors_url, headers=HEADERS)
+        # Check contributors (at least 2) -- REST, since GraphQL has no commit-contributor count
+        contributors_url = f"https://api.github.com/repos/{repo['nameWithOwner']}/contributors?per_page=2"
+        contributors_resp = github_get(contributors_url)
 
         if contributors_resp.status_code != 200:
             continue
 
-        contributors = contributors_resp.json()
+        contributors = json_loads(contributors_resp.content)
         if len(contributors) < 2:
             continue
 
-        # Check README
-        readme_url = f"https://api.github.com/repos/{repo['full_name']}/readme"
-        readme_resp = requests.get(readme_url, headers=HEADERS)
-        has_readme = readme_resp.status_code == 200
+        # Check README (REST /readme also finds other names and docs/ or .github/ READMEs)
+        has_readme = any(repo.get(f"r{i}") for i in range(len(README_NAMES)))
+        if not has_readme:
+            readme_url = f"https://api.github.com/repos/{repo['nameWithOwner']}/readme"
+            readme_resp = github_get(readme_url)
+            has_readme = readme_resp.status_code == 200
 
         # Check Wiki
-        has_wiki = repo.get("has_wiki", False)
+        has_wiki = repo.get("hasWikiEnabled", False)
 
         if not (has_readme or has_wiki):
             continue
 
         # Keep repository
         results.append({
-            "repository": repo["full_name"],
-            "url": repo["html_url"],
-            "last_update": repo["updated_at"],
-            "language": repo.get("language"),
+            "repository": repo["nameWithOwner"],
+            "url": repo["url"],
+            "last_update": repo["updatedAt"],
+            "language": language,
             "contributors_min_2": True,
             "has_readme": has_readme,
             "has_wiki": has_wiki
         })
 
-        print(f"    ✔ Kept: {repo['full_name']}")
+        print(f"    ✔ Kept: {repo['nameWithOwner']}")
 
+    if not search["pageInfo"]["hasNextPage"]:
+        break
+    cursor = search["pageInfo"]["endCursor"]
     page += 1
 
 print("-----------------------------------------------")
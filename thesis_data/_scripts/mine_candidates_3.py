@@ -18,12 +18,25 @@ Optional:
     --gh_mapping_csv  <path>    Mapping CSV for GitHub repo_id -> repo_name
                                 (deterministic schema: must have columns repo_id, repo_name)
                                 If omitted, defaults to <dataset_root>/repos.csv if present.
+    --workers         <int>     Worker processes (0 = one per CPU, 1 = mine in-process)
+    --output_format   csv|parquet  Output file format (default csv; parquet needs pyarrow)
+
+Repos are mined in parallel worker processes (one repo per task); output
+order is the same as a sequential run.
 
 Outputs (_outputs folder):
     candidates.csv          explicit constraint candidates
     arch_descriptions.csv   architectural description candidates
     excluded_normative.csv  normative passages that failed gating or were excluded
     annotation.csv          union of all above (for manual labeling)
+With --output_format parquet the same four tables are written as zstd
+Parquet files (.parquet), without the sep=/BOM preamble; 0/1 flag columns
+are int8 and null where the rule engine did not run.
+
+If the optional `hyperscan` package is installed, keyword matching on ASCII
+paragraphs runs through one Hyperscan database covering every category.
+Otherwise, if `google-re2` is installed, an RE2 prefilter skips the regex
+scan for ASCII paragraphs that contain no keyword at all.
 """
 
 import os
@@ -32,8 +45,29 @@ import csv
 import sys
 import uuid
 import argparse
+from functools import partial, lru_cache
+from contextlib import nullcontext
+from itertools import islice, product
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterator
+
+try:
+    import hyperscan
+except ImportError:  # optional accelerator; the combined regexes are used instead
+    hyperscan = None
+
+try:
+    import re2
+except ImportError:  # optional prefilter for the regex path; see build_re2_gate
+    re2 = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # only needed for --output_format parquet
+    pa = pq = None
 
 
 # ===============================
@@ -221,6 +255,15 @@ HARD_EXCLUDE_DIRS = {
 
 MAX_FILE_BYTES = 2_000_000  # 2 MB
 
+# doc files read ahead on a thread pool while the current one is mined
+READ_AHEAD_FILES = 8
+
+# doc files whose name starts with one of these are collected anywhere in the repo
+DOC_NAME_SIGNALS = (
+    "architecture", "arch", "design", "overview",
+    "structure", "documentation",
+)
+
 
 # ===============================
 # CSV SCHEMA
@@ -260,6 +303,10 @@ ANNOTATION_EXTRA = [
 
 ANNOTATION_COLUMNS = CSV_COLUMNS + ANNOTATION_EXTRA
 
+# Rows are plain lists in column order; these give a column's position
+CSV_COL_IDX        = {c: i for i, c in enumerate(CSV_COLUMNS)}
+CANDIDATE_TYPE_IDX = CSV_COL_IDX["candidate_type"]
+
 
 # ===============================
 # UTILITIES
@@ -273,8 +320,17 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+_WS_RX = re.compile(r"\s+")
+
+
 def norm_text(s: str) -> str:
-    return re.sub(r"\s+", " ", s.strip().lower())
+    return _WS_RX.sub(" ", s.strip().lower())
+
+
+# ASCII control chars (incl. CR/LF/TAB, vertical tab \x0b, form feed \x0c),
+# DEL and the Unicode line separators all become a plain space
+_SANITIZE_TABLE = {c: 0x20 for c in [*range(0x00, 0x20), 0x7F, 0x2028, 0x2029]}
+_MULTI_WS_RX = re.compile(r"\s{2,}")
 
 
 def sanitize_for_csv_cell(s: str) -> str:
@@ -284,29 +340,53 @@ def sanitize_for_csv_cell(s: str) -> str:
     """
     if not s:
         return ""
-    s = s.replace("\r\n", "\n").replace("\r", "\n")
-    s = s.replace("\n", " ").replace("\t", " ")
+    # \s{2,} (not \s+): a lone non-space whitespace char such as NBSP is kept
+    return _MULTI_WS_RX.sub(" ", s.translate(_SANITIZE_TABLE)).strip()
 
-    # Strip ASCII control chars incl. vertical tab \x0b and form feed \x0c
-    s = re.sub(r"[\x00-\x1F\x7F]", " ", s)
 
-    # Unicode line separators
-    s = s.replace("\u2028", " ").replace("\u2029", " ")
+def phrase_regex(p_norm: str) -> str:
+    # Every phrase regex starts with \b; compile_phrase_patterns relies on it
+    if " " in p_norm:
+        parts = [re.escape(x) for x in p_norm.split()]
+        return r"\b" + r"\s+".join(parts) + r"\b"
+    return r"\b" + re.escape(p_norm) + r"\b"
 
-    return re.sub(r"\s{2,}", " ", s).strip()
 
+PhraseMatcher = Tuple[re.Pattern, List[str], List[Tuple[int, ...]]]
 
-def compile_phrase_patterns(phrases: List[str]) -> List[Tuple[str, re.Pattern]]:
-    out = []
-    for p in phrases:
-        p_norm = p.strip().lower()
-        if " " in p_norm:
-            parts = [re.escape(x) for x in p_norm.split()]
-            rx = r"\b" + r"\s+".join(parts) + r"\b"
-        else:
-            rx = r"\b" + re.escape(p_norm) + r"\b"
-        out.append((p_norm, re.compile(rx, flags=re.IGNORECASE)))
-    return out
+
+def compile_phrase_patterns(phrases: List[str]) -> PhraseMatcher:
+    """
+    Compile one category into a single combined regex.
+
+    Each phrase becomes one alternative of a lookahead that is tried at every
+    word boundary, so a single finditer pass finds every position where some
+    phrase starts. The alternative is tagged by an empty named group k<i>
+    placed after the phrase, not around it: re saves every open group's marks
+    on each repeat, so an enclosing group makes large alternations quadratic.
+    Only one alternative is reported per position (longest phrase first), so
+    implied[i] lists the phrases whose own regex matches inside phrase i
+    (e.g. "must" inside "must not"); those are hit whenever i is.
+    """
+    labels = [p.strip().lower() for p in phrases]
+    patterns = [re.compile(phrase_regex(lab), flags=re.IGNORECASE) for lab in labels]
+
+    order = sorted(range(len(labels)), key=lambda i: -len(" ".join(labels[i].split())))
+    alternation = "|".join(f"(?:{phrase_regex(labels[i])[2:]})(?P<k{i}>)" for i in order)
+    combined = re.compile(r"\b(?=" + alternation + ")", flags=re.IGNORECASE)
+
+    implied = []
+    for i, lab in enumerate(labels):
+        # Pad the phrase the way real text around a match must look for its
+        # edge \b to hold, and only accept matches inside the phrase itself
+        canonical = " ".join(lab.split())
+        left = "a" if not re.match(r"\w", canonical) else " "
+        right = "a" if not re.search(r"\w$", canonical) else " "
+        padded = left + canonical + right
+        inner = [j for j, rx in enumerate(patterns)
+                 if any(m.start() >= 1 and m.end() <= len(padded) - 1 for m in rx.finditer(padded))]
+        implied.append(tuple(sorted(set(inner) | {i})))
+    return combined, labels, implied
 
 
 NORM_STRONG_PATTERNS = compile_phrase_patterns(NORMATIVE_STRONG)
@@ -318,11 +398,152 @@ EXCL_PATTERNS        = compile_phrase_patterns(EXCLUSION_TOPICS)
 OVERRIDE_PATTERNS    = compile_phrase_patterns(OVERRIDE_KEYWORDS)
 
 
-def find_hits(text: str, compiled: List[Tuple[str, re.Pattern]]) -> List[str]:
-    return [label for label, rx in compiled if rx.search(text)]
+def find_hit_indexes(text: str, compiled: PhraseMatcher) -> set:
+    """Indexes (into the matcher's labels) of all phrases found in text."""
+    rx, _, implied = compiled
+    found = set()
+    for m in rx.finditer(text):
+        found.update(implied[int(m.lastgroup[1:])])
+    return found
+
+
+def find_hits(text: str, compiled: PhraseMatcher) -> List[str]:
+    """Labels of all phrases found in text, in configuration order."""
+    labels = compiled[1]
+    return [labels[i] for i in sorted(find_hit_indexes(text, compiled))]
+
+
+CATEGORY_PATTERNS: List[Tuple[str, PhraseMatcher]] = [
+    ("style",       STYLE_PATTERNS),
+    ("noun",        NOUN_PATTERNS),
+    ("rel",         REL_PATTERNS),
+    ("norm_strong", NORM_STRONG_PATTERNS),
+    ("norm_weak",   NORM_WEAK_PATTERNS),
+    ("excl",        EXCL_PATTERNS),
+    ("override",    OVERRIDE_PATTERNS),
+]
+
+
+def build_hyperscan_db():
+    """
+    One Hyperscan database over the phrases of every category (ids are global
+    indexes; ranges maps category -> [start, end) of its ids).
+    Returns None when hyperscan is not installed.
+    """
+    if hyperscan is None:
+        return None
+    expressions: List[bytes] = []
+    labels: List[str] = []
+    ranges: Dict[str, Tuple[int, int]] = {}
+    for cat, (_, cat_labels, _) in CATEGORY_PATTERNS:
+        start = len(expressions)
+        expressions.extend(phrase_regex(lab).encode("ascii") for lab in cat_labels)
+        labels.extend(cat_labels)
+        ranges[cat] = (start, len(expressions))
+
+    db = hyperscan.Database()
+    db.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+    )
+    return db, labels, ranges
+
+
+HYPERSCAN_DB = build_hyperscan_db()
+
+
+def _hs_collect(match_id: int, start: int, end: int, flags: int, found: set) -> None:
+    found.add(match_id)
+
+
+CATEGORY_BY_NAME = dict(CATEGORY_PATTERNS)
+
+# categories that decide whether a paragraph is routed at all, and the ones
+# that only matter once it is
+ALL_CATEGORIES       = tuple(CATEGORY_BY_NAME)
+ROUTING_CATEGORIES   = ("style", "noun", "rel", "norm_strong", "norm_weak")
+EXCLUSION_CATEGORIES = ("excl", "override")
+
+
+def fuse_categories(categories: Tuple[str, ...]) -> Tuple[PhraseMatcher, Dict[str, Tuple[int, int]]]:
+    """
+    One combined matcher over the phrases of several categories, plus each
+    category's [start, end) index range, so a single finditer pass serves all
+    of them (implied hits work across categories too, e.g. "import" inside
+    "should not import").
+    """
+    phrases: List[str] = []
+    ranges: Dict[str, Tuple[int, int]] = {}
+    for cat in categories:
+        cat_labels = CATEGORY_BY_NAME[cat][1]
+        ranges[cat] = (len(phrases), len(phrases) + len(cat_labels))
+        phrases.extend(cat_labels)
+    return compile_phrase_patterns(phrases), ranges
+
+
+FUSED_CATEGORIES = {
+    cats: fuse_categories(cats)
+    for cats in (ALL_CATEGORIES, ROUTING_CATEGORIES, EXCLUSION_CATEGORIES)
+}
+
+# Python's \s on ASCII text; RE2's \s lacks \v and \x1c-\x1f
+_RE2_ASCII_WS = r"[\t-\r\x1c-\x1f ]+"
+
+
+def build_re2_gate(labels: List[str]):
+    """
+    RE2 pattern that matches an ASCII text iff some phrase_regex(label) does.
+
+    RE2 has no lookahead, so it cannot replace the combined pattern (which
+    must report overlapping phrases), but as a plain alternation it answers
+    "any hit at all?" in one linear-time DFA pass. On ASCII input its \b and
+    (?i) agree with Python's re; only the whitespace class needs spelling out.
+    None when re2 is not installed or the phrases do not translate.
+    """
+    if re2 is None or not all(lab.isascii() for lab in labels):
+        return None
+    alternation = "|".join(
+        _RE2_ASCII_WS.join(re.escape(w) for w in lab.split()) + r"\b" for lab in labels
+    )
+    try:
+        return re2.compile(r"(?i)\b(?:" + alternation + ")")
+    except re2.error:
+        return None
+
 
+RE2_GATES = {cats: build_re2_gate(FUSED_CATEGORIES[cats][0][1]) for cats in FUSED_CATEGORIES}
 
-def looks_like_excluded_artifact(rel_path: str) -> List[str]:
+
+def find_category_hits(text: str, categories: Tuple[str, ...] = ALL_CATEGORIES) -> Dict[str, List[str]]:
+    """
+    Hits for the given keyword categories in one call.
+
+    Hyperscan is only used for ASCII text: there its \b, \s and caseless
+    matching agree exactly with Python's re, which handles everything else.
+    A Hyperscan scan costs the same for any subset, so it returns every category.
+    Without Hyperscan, ASCII text with no hit at all is rejected by the RE2
+    gate (if re2 is installed) before the combined regex runs.
+    """
+    if HYPERSCAN_DB is not None and text.isascii():
+        db, labels, ranges = HYPERSCAN_DB
+        found: set = set()
+        db.scan(text.encode("ascii"), match_event_handler=_hs_collect, context=found)
+        return {cat: [labels[i] for i in range(a, b) if i in found] for cat, (a, b) in ranges.items()}
+    compiled, ranges = FUSED_CATEGORIES[categories]
+    gate = RE2_GATES[categories]
+    if gate is not None and text.isascii() and not gate.search(text):
+        return {cat: [] for cat in ranges}
+    labels = compiled[1]
+    found = find_hit_indexes(text, compiled)
+    return {cat: [labels[i] for i in range(a, b) if i in found] for cat, (a, b) in ranges.items()}
+
+
+@lru_cache(maxsize=100_000)
+def looks_like_excluded_artifact(rel_path: str) -> Tuple[str, ...]:
+    # Pure in rel_path and called for every paragraph of a file: cached, so the
+    # result is a tuple (shared between calls, must not be mutated)
     hits = []
     low = rel_path.lower().replace("/", os.sep).replace("\\", os.sep)
 
@@ -335,44 +556,63 @@ def looks_like_excluded_artifact(rel_path: str) -> List[str]:
         if base_noext.startswith(pref):
             hits.append(pref)
 
-    return hits
+    return tuple(hits)
 
 
 # ===============================
 # CODE/CONFIG DETECTION
 # ===============================
 
-def looks_like_code_or_config(paragraph: str) -> bool:
-    s = paragraph.strip()
-    if not s:
-        return False
+_COLON_LINE_RX  = re.compile(r"^\s*[-\w.]+\s*:\s*\S*")
+_PROMPT_LINE_RX = re.compile(r"^\s*[$>#]\s+\S+")
+_FLAG_LINE_RX   = re.compile(r"\s--\w+")
+_TAG_RX         = re.compile(r"</?\w+")
+
+CODE_SPECIAL_CHARS = "{}[]<>:=/\\|`~"
+
+# ASCII bytes that are not letters / not special chars; deleting them from
+# the ASCII part of a paragraph leaves only the characters being counted
+_NON_ALPHA_ASCII   = bytes(i for i in range(128) if not chr(i).isalpha())
+_NON_SPECIAL_ASCII = bytes(i for i in range(128) if chr(i) not in CODE_SPECIAL_CHARS)
+
+
+def letter_count(s: str) -> int:
+    """Number of str.isalpha() characters in s, counted in C for ASCII text."""
+    if s.isascii():
+        return len(s.encode("ascii").translate(None, _NON_ALPHA_ASCII))
+    return sum(map(str.isalpha, s))
+
+
+def _at_least_two(pred, lines: List[str]) -> bool:
+    """Whether pred holds for 2+ lines; stops at the second hit (filter/islice run in C)."""
+    return next(islice(filter(pred, lines), 1, None), None) is not None
 
+
+def looks_like_code_or_config(s: str, alpha: int) -> bool:
+    """s is a stripped, non-empty paragraph and alpha its letter_count()."""
     lines = s.splitlines()
     if len(lines) >= 2:
-        colon_lines = sum(1 for l in lines if re.match(r"^\s*[-\w.]+\s*:\s*\S*", l))
-        if colon_lines >= 2:
+        if _at_least_two(_COLON_LINE_RX.match, lines):
             return True
 
-        prompt_lines = sum(1 for l in lines if re.match(r"^\s*[$>#]\s+\S+", l))
-        if prompt_lines >= 2:
+        if _at_least_two(_PROMPT_LINE_RX.match, lines):
             return True
 
-        flag_lines = sum(1 for l in lines if re.search(r"\s--\w+", l))
-        if flag_lines >= 2:
+        if _at_least_two(_FLAG_LINE_RX.search, lines):
             return True
 
-    st = s.lstrip()
-    if st.startswith("{") and ":" in st and ("}" in st or "\n" in st):
+    if s.startswith("{") and ":" in s and ("}" in s or "\n" in s):
         return True
 
-    if st.startswith("<") and ">" in st and re.search(r"</?\w+", st):
+    if s.startswith("<") and ">" in s and _TAG_RX.search(s):
         return True
 
-    special = sum(1 for c in s if c in "{}[]<>:=/\\|`~")
+    # The special chars are all ASCII, so one C-level pass over the ASCII part
+    # of s counts them exactly
+    special = len(s.encode("ascii", "ignore").translate(None, _NON_SPECIAL_ASCII))
     if special / max(1, len(s)) > 0.10:
         return True
 
-    alpha = sum(1 for c in s if c.isalpha())
     if len(s) >= 60 and (alpha / len(s)) < 0.45:
         return True
 
@@ -455,6 +695,10 @@ def load_gh_mapping(path: Optional[str]) -> Dict[str, str]:
 # REPO SCAN
 # ===============================
 
+_GH_DIR_RX = re.compile(r"gh_\d{3}", flags=re.IGNORECASE)
+_SF_DIR_RX = re.compile(r"sf_\d{3}", flags=re.IGNORECASE)
+
+
 def scan_repos(dataset_root: str, sf_mapping: Dict[str, str], gh_mapping: Dict[str, str]) -> List[Dict[str, str]]:
     repos = []
     for name in os.listdir(dataset_root):
@@ -462,7 +706,7 @@ def scan_repos(dataset_root: str, sf_mapping: Dict[str, str], gh_mapping: Dict[s
         if not os.path.isdir(full):
             continue
 
-        if re.fullmatch(r"gh_\d{3}", name, flags=re.IGNORECASE):
+        if _GH_DIR_RX.fullmatch(name):
             rid = name.strip().lower()
             repos.append({
                 "repo_id": rid,
@@ -470,7 +714,7 @@ def scan_repos(dataset_root: str, sf_mapping: Dict[str, str], gh_mapping: Dict[s
                 "repo_root": full,
                 "repo_origin_name": gh_mapping.get(rid, ""),
             })
-        elif re.fullmatch(r"sf_\d{3}", name, flags=re.IGNORECASE):
+        elif _SF_DIR_RX.fullmatch(name):
             rid = name.strip().lower()
             repos.append({
                 "repo_id": rid,
@@ -495,38 +739,60 @@ def is_text_doc(path: str) -> bool:
     return ext in TEXT_EXTS
 
 
-def collect_doc_files(repo_root: str) -> List[str]:
-    result = []
-    for dirpath, dirnames, filenames in os.walk(repo_root):
-        dirnames[:] = [d for d in dirnames if d not in HARD_EXCLUDE_DIRS]
+def _scan_dir(path: str) -> Tuple[List[os.DirEntry], List[os.DirEntry]]:
+    """Split a directory's entries into (subdirs, files) like os.walk does."""
+    dirs, files = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirs if is_dir else files).append(entry)
+    except OSError:
+        pass
+    return dirs, files
+
 
-        for fn in filenames:
-            full = os.path.join(dirpath, fn)
+def collect_doc_files(repo_root: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (rel_path, full_path) for every documentation file in the repo, in
+    walk order; callers sort by rel_path.lower() when they need a stable order.
+    """
+    # Depth-first, pre-order (same visiting order as os.walk); each DirEntry
+    # caches its stat() result, so the size check costs no extra path lookup.
+    # Stack frames carry the directory's path relative to repo_root.
+    stack = [(repo_root, "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        dirs, files = _scan_dir(dir_path)
+        stack.extend(reversed([
+            (d.path, os.path.join(rel_dir, d.name))
+            for d in dirs
+            if d.name not in HARD_EXCLUDE_DIRS and not d.is_symlink()
+        ]))
+
+        for entry in files:
             try:
-                if os.path.getsize(full) > MAX_FILE_BYTES:
+                if entry.stat().st_size > MAX_FILE_BYTES:
                     continue
             except OSError:
                 continue
 
-            if not is_text_doc(full):
+            if not is_text_doc(entry.name):
                 continue
 
-            rel      = os.path.relpath(full, repo_root)
+            rel      = os.path.join(rel_dir, entry.name)
             rel_low  = rel.lower().replace("\\", "/")
             base_low = os.path.basename(rel_low)
 
             in_docs     = rel_low.startswith("docs/") or "/docs/" in rel_low
             is_readme   = base_low.startswith("readme")
-            name_signal = any(base_low.startswith(x) for x in [
-                "architecture", "arch", "design", "overview",
-                "structure", "documentation",
-            ])
+            name_signal = base_low.startswith(DOC_NAME_SIGNALS)
 
             if is_readme or in_docs or name_signal:
-                result.append(full)
-
-    result.sort(key=lambda p: os.path.relpath(p, repo_root).lower())
-    return result
+                yield rel, entry.path
 
 
 # ===============================
@@ -534,34 +800,92 @@ def collect_doc_files(repo_root: str) -> List[str]:
 # ===============================
 
 def read_text_file(path: str) -> str:
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            with open(path, "r", encoding=enc, errors="strict") as f:
-                return f.read()
-        except (UnicodeDecodeError, OSError):
-            continue
+    # Read the bytes once and decode in memory: UTF-8 (a BOM is kept, as before),
+    # else latin-1, which never fails. Newlines are left as-is; iter_paragraphs
+    # normalizes \r\n and \r itself.
+    # There is deliberately no per-extension "last encoding that worked" hint:
+    # latin-1 accepts any bytes, so once it stuck, later UTF-8 files would be
+    # decoded as mojibake instead of failing over.
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
+        with open(path, "rb") as f:
+            data = f.read()
     except OSError:
         return ""
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
 
 
-def split_paragraphs(text: str) -> List[str]:
+_READ_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def iter_file_texts(doc_files: List[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (rel_path, read_text_file(full_path)) in doc_files order, keeping up
+    to READ_AHEAD_FILES reads in flight on a thread pool so disk latency
+    overlaps with mining the current file (file reads release the GIL).
+    The pool is created on first use, i.e. inside each worker process.
+    """
+    global _READ_POOL
+    if _READ_POOL is None:
+        _READ_POOL = ThreadPoolExecutor(max_workers=READ_AHEAD_FILES)
+
+    files   = iter(doc_files)
+    pending = deque(
+        (rel_path, _READ_POOL.submit(read_text_file, fp))
+        for rel_path, fp in islice(files, READ_AHEAD_FILES)
+    )
+    while pending:
+        rel_path, future = pending.popleft()
+        nxt = next(files, None)
+        if nxt is not None:
+            pending.append((nxt[0], _READ_POOL.submit(read_text_file, nxt[1])))
+        yield rel_path, future.result()
+
+
+_PARA_SPLIT_RX = re.compile(r"\n\s*\n")
+
+
+def iter_paragraphs(text: str) -> Iterator[str]:
+    """
+    Stripped paragraphs of at least 20 chars, yielded lazily: the text is
+    walked separator by separator, so no list of all pieces is built first.
+    """
     t = text.replace("\r\n", "\n").replace("\r", "\n")
-    return [p.strip() for p in re.split(r"\n\s*\n", t) if len(p.strip()) >= 20]
+    start = 0
+    for m in _PARA_SPLIT_RX.finditer(t):
+        p = t[start:m.start()].strip()
+        if len(p) >= 20:
+            yield p
+        start = m.end()
+    p = t[start:].strip()
+    if len(p) >= 20:
+        yield p
 
 
 # ===============================
 # LANGUAGE GATE
 # ===============================
 
-EN_STOPWORDS = {"the", "and", "is", "to", "of", "in", "for", "with", "on", "as", "are", "be"}
+# frozenset: membership is the only operation on the hot path
+EN_STOPWORDS = frozenset({"the", "and", "is", "to", "of", "in", "for", "with", "on", "as", "are", "be"})
 
+_TOKEN_RX = re.compile(r"[a-zA-Z']+")
 
-def detect_language(paragraph: str) -> str:
+# Every upper/lower spelling of each stopword ("the", "The", "tHE", ...), so
+# tokens of ASCII text can be checked without lowercasing the paragraph
+EN_STOPWORDS_ANY_CASE = frozenset(
+    "".join(chars)
+    for w in EN_STOPWORDS
+    for chars in product(*[(c, c.upper()) for c in w])
+)
+
+
+def detect_language(s: str, alpha: int) -> str:
     """
-    Returns 'en' or 'non_en'.
+    Returns 'en' or 'non_en' for a stripped, non-empty paragraph s, given
+    its letter_count().
 
     Patched heuristic for technical English:
       - ASCII ratio >= 0.80
@@ -569,37 +893,81 @@ def detect_language(paragraph: str) -> str:
       - English if:
           (stopword hit >= 1) OR (alphabetic ratio >= 0.55)
     """
-    s = paragraph.strip()
-    if not s:
-        return "non_en"
+    # str.isascii() is a flag check for compact strings, so the common
+    # pure-ASCII paragraph skips the ratio computation entirely
+    if s.isascii():
+        # lower() cannot change ASCII token boundaries, so the token rules
+        # run on s directly instead of on a lowercased copy
+        tokens = _TOKEN_RX.findall(s)
+        if len(tokens) < 3:
+            return "non_en"
+        if not EN_STOPWORDS_ANY_CASE.isdisjoint(tokens):
+            return "en"
+    else:
+        if len(s.encode("ascii", "ignore")) / len(s) < 0.80:
+            return "non_en"
+        # lowercasing can turn non-ASCII letters into ASCII ones (e.g. the
+        # Kelvin sign into "k"), so tokenize the lowercased text here
+        tokens = _TOKEN_RX.findall(s.lower())
+        if len(tokens) < 3:
+            return "non_en"
+        if not EN_STOPWORDS.isdisjoint(tokens):
+            return "en"
+
+    if alpha / len(s) >= 0.55:
+        return "en"
 
-    ascii_chars = sum(1 for ch in s if ord(ch) < 128)
-    if ascii_chars / max(1, len(s)) < 0.80:
-        return "non_en"
+    return "non_en"
 
-    tokens = re.findall(r"[a-zA-Z']+", s.lower())
-    if len(tokens) < 3:
-        return "non_en"
 
-    stop_hit = sum(1 for t in tokens if t in EN_STOPWORDS)
-    alpha_ratio = sum(c.isalpha() for c in s) / max(1, len(s))
+def classify_paragraph(paragraph: str) -> Tuple[str, Optional[str]]:
+    """
+    Run the per-paragraph gates in order and return (lang, tnorm):
+    ("n/a", None) for code/config, ("non_en", None) for non-English text,
+    ("en", norm_text(paragraph)) otherwise.
 
-    if stop_hit >= 1 or alpha_ratio >= 0.55:
-        return "en"
+    The stripped text and its letter count are computed once and shared by
+    the code/config detector and the language gate; only English paragraphs
+    are lowercased, for the normalization.
+    """
+    s = paragraph.strip()
+    if not s:
+        return "non_en", None
 
-    return "non_en"
+    alpha = letter_count(s)
+    if looks_like_code_or_config(s, alpha):
+        return "n/a", None
+
+    if detect_language(s, alpha) != "en":
+        return "non_en", None
+
+    # same as norm_text(s): s is already stripped
+    return "en", _WS_RX.sub(" ", s.lower())
 
 
 # ===============================
 # RULE ENGINE
 # ===============================
 
-def compute_rule_fields(text: str, rel_path: str) -> Dict[str, object]:
-    tnorm = norm_text(text)
+# Boilerplate paragraphs (licenses, install steps, badges) repeat verbatim
+# across files and repos; the per-text part of the rule fields is cached
+RULE_CACHE_SIZE = 50000
+
+
+@lru_cache(maxsize=RULE_CACHE_SIZE)
+def _text_rule_fields(tnorm: str) -> Optional[Tuple[Dict[str, object], Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    The path-independent part of compute_rule_fields(): the rule fields
+    without the exclusion ones, plus the exclusion-topic and override hits.
+    None when the paragraph has neither an architectural nor a normative hit
+    (route_candidate_type() skips those whatever the exclusion result, so
+    the exclusion scans are not run).
+    """
+    hits  = find_category_hits(tnorm, ROUTING_CATEGORIES)
 
-    style_hits = find_hits(tnorm, STYLE_PATTERNS)
-    noun_hits  = find_hits(tnorm, NOUN_PATTERNS)
-    rel_hits   = find_hits(tnorm, REL_PATTERNS)
+    style_hits = hits["style"]
+    noun_hits  = hits["noun"]
+    rel_hits   = hits["rel"]
 
     has_style = 1 if style_hits else 0
     has_noun  = 1 if noun_hits  else 0
@@ -607,16 +975,20 @@ def compute_rule_fields(text: str, rel_path: str) -> Dict[str, object]:
 
     arch_hit = 1 if (has_style or has_noun or (has_rel and has_noun)) else 0
 
+    strong_hits = hits["norm_strong"]
+    weak_hits   = hits["norm_weak"]
+    norm_hit    = 1 if (strong_hits or weak_hits) else 0
+
+    if not arch_hit and not norm_hit:
+        return None
+
+    # Only paragraphs that can be routed get their label strings built
     arch_hits_parts = []
     if style_hits: arch_hits_parts.append("style:" + "|".join(style_hits))
     if noun_hits:  arch_hits_parts.append("noun:"  + "|".join(noun_hits))
     if rel_hits:   arch_hits_parts.append("rel:"   + "|".join(rel_hits))
     arch_hits_str = "; ".join(arch_hits_parts)
 
-    strong_hits = find_hits(tnorm, NORM_STRONG_PATTERNS)
-    weak_hits   = find_hits(tnorm, NORM_WEAK_PATTERNS)
-    norm_hit    = 1 if (strong_hits or weak_hits) else 0
-
     norm_strength = ""
     if weak_hits:
         norm_strength = "weak"
@@ -625,31 +997,47 @@ def compute_rule_fields(text: str, rel_path: str) -> Dict[str, object]:
 
     norm_hits_str = "|".join(strong_hits + weak_hits)
 
-    excl_topic_hits  = find_hits(tnorm, EXCL_PATTERNS)
-    excl_path_hits   = looks_like_excluded_artifact(rel_path)
-    excl_hits_all    = excl_topic_hits + excl_path_hits
-    exclusion_hit    = 1 if excl_hits_all else 0
-    excl_hits_str    = "|".join(excl_hits_all)
+    if "excl" not in hits:
+        hits.update(find_category_hits(tnorm, EXCLUSION_CATEGORIES))
 
-    override_hits     = find_hits(tnorm, OVERRIDE_PATTERNS)
-    override_hit      = 1 if override_hits else 0
-    override_hits_str = "|".join(override_hits)
-
-    excluded = 1 if (exclusion_hit and not override_hit) else 0
-
-    return {
+    fields = {
         "arch_hit":            arch_hit,
         "has_style_phrase":    has_style,
         "has_structural_noun": has_noun,
         "has_relation_verb":   has_rel,
         "norm_hit":            norm_hit,
         "norm_strength":       norm_strength,
-        "excluded":            excluded,
         "norm_hits":           norm_hits_str,
         "arch_hits":           arch_hits_str,
-        "excl_hits":           excl_hits_str,
-        "override_hits":       override_hits_str,
     }
+    return fields, tuple(hits["excl"]), tuple(hits["override"])
+
+
+def compute_rule_fields(tnorm: str, rel_path: str) -> Optional[Dict[str, object]]:
+    """
+    Rule fields for an English paragraph given its norm_text() form, or None
+    when it has neither an architectural nor a normative hit.
+    """
+    cached = _text_rule_fields(tnorm)
+    if cached is None:
+        return None
+    text_fields, excl_topic_hits, override_hits = cached
+
+    excl_path_hits   = looks_like_excluded_artifact(rel_path)
+    excl_hits_all    = excl_topic_hits + excl_path_hits
+    exclusion_hit    = 1 if excl_hits_all else 0
+    excl_hits_str    = "|".join(excl_hits_all)
+
+    override_hit      = 1 if override_hits else 0
+    override_hits_str = "|".join(override_hits)
+
+    excluded = 1 if (exclusion_hit and not override_hit) else 0
+
+    fields = dict(text_fields)
+    fields["excluded"]      = excluded
+    fields["excl_hits"]     = excl_hits_str
+    fields["override_hits"] = override_hits_str
+    return fields
 
 
 def route_candidate_type(arch_hit: int, norm_hit: int, excluded: int) -> Optional[str]:
@@ -664,55 +1052,238 @@ def route_candidate_type(arch_hit: int, norm_hit: int, excluded: int) -> Optiona
     return None
 
 
+# route_candidate_type() tabulated over its 8 possible inputs, indexed by
+# arch_hit | norm_hit << 1 | excluded << 2; the rules above stay the spec
+ROUTE_TABLE = tuple(
+    route_candidate_type(arch_hit=i & 1, norm_hit=(i >> 1) & 1, excluded=(i >> 2) & 1)
+    for i in range(8)
+)
+
+
 # ===============================
 # CSV HELPERS
 # ===============================
 
-def open_csv_writer(path: str, columns: List[str]) -> Tuple[csv.DictWriter, object]:
-    f = open(path, "w", encoding="utf-8-sig", newline="")
+CSV_WRITE_BUFFER = 1 << 20
+CSV_BATCH_ROWS   = 4096
+
+
+def _quote_field(value) -> str:
+    """One QUOTE_ALL cell body (without the surrounding quotes), as csv would write it."""
+    if value.__class__ is not str:
+        value = "" if value is None else str(value)
+    return value.replace('"', '""') if '"' in value else value
+
+
+class QuotedCsvWriter:
+    """
+    Writes rows given as sequences in fieldnames order, with the same output
+    as csv.writer(quoting=csv.QUOTE_ALL) (comma-separated, every cell quoted,
+    quotes doubled, \r\n line ends).
+    Each row is one join over the columns instead of csv's per-field quoting
+    decisions; rows are collected and handed to the file CSV_BATCH_ROWS at a
+    time as one string. Call flush() before closing the file.
+
+    With blank_tail=n, rows omit the last n columns and the writer emits
+    them as empty cells through a precomputed line ending.
+    """
+
+    def __init__(self, f, fieldnames: List[str], blank_tail: int = 0):
+        self.f = f
+        self.fieldnames = list(fieldnames)
+        self._line_end = '"' + ',""' * blank_tail + "\r\n"
+        self._buf: List[str] = []
+
+    def writeheader(self) -> None:
+        self._buf.append('"' + '","'.join(map(_quote_field, self.fieldnames)) + '"\r\n')
+
+    def writerow(self, row: List[object]) -> None:
+        self._buf.append('"' + '","'.join(map(_quote_field, row)) + self._line_end)
+        if len(self._buf) >= CSV_BATCH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        self.f.write("".join(self._buf))
+        self._buf.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.f.close()
+
+
+def open_csv_writer(path: str, columns: List[str], blank_tail: int = 0) -> QuotedCsvWriter:
+    f = open(path, "w", encoding="utf-8-sig", newline="", buffering=CSV_WRITE_BUFFER)
     f.write("sep=,\n")
-    writer = csv.DictWriter(
-        f,
-        fieldnames=columns,
-        delimiter=",",
-        quoting=csv.QUOTE_ALL,
-    )
+    writer = QuotedCsvWriter(f, columns, blank_tail)
     writer.writeheader()
-    return writer, f
+    return writer
+
+
+PARQUET_BATCH_ROWS = 16384
+
+# 0/1 flags; they are "" on rows that never reached the rule engine and
+# are stored as nulls there
+PARQUET_INT8_COLUMNS = {
+    "arch_hit", "has_style_phrase", "has_structural_noun",
+    "has_relation_verb", "norm_hit", "excluded",
+}
+
+
+def _parquet_type(column: str):
+    if column in PARQUET_INT8_COLUMNS:
+        return pa.int8()
+    if column == "paragraph_index":
+        return pa.int32()
+    if column == "text":
+        return pa.large_string()
+    return pa.string()
+
+
+class ParquetRowWriter:
+    """
+    QuotedCsvWriter's interface over a zstd-compressed Parquet file: rows are
+    buffered and transposed into one record batch per PARQUET_BATCH_ROWS.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], blank_tail: int = 0):
+        self.fieldnames = list(fieldnames)
+        self.blank_tail = blank_tail
+        self.schema = pa.schema([(c, _parquet_type(c)) for c in self.fieldnames])
+        self._flag_idx = [i for i, c in enumerate(self.fieldnames) if c in PARQUET_INT8_COLUMNS]
+        self._pw = pq.ParquetWriter(path, self.schema, compression="zstd")
+        self._buf: List[List[object]] = []
+
+    def writeheader(self) -> None:
+        pass  # the schema carries the column names
+
+    def writerow(self, row: List[object]) -> None:
+        self._buf.append(row)
+        if len(self._buf) >= PARQUET_BATCH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buf:
+            return
+        columns = [list(col) for col in zip(*self._buf)]
+        columns += [[""] * len(self._buf)] * self.blank_tail
+        for i in self._flag_idx:
+            columns[i] = [None if v == "" else v for v in columns[i]]
+        arrays = [pa.array(col, type=field.type) for col, field in zip(columns, self.schema)]
+        self._pw.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self._buf.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._pw.close()
+
+
+def open_output_writer(out_dir: str, name: str, columns: List[str], output_format: str,
+                       blank_tail: int = 0):
+    """Writer for output <name> (e.g. "candidates") as .csv or .parquet."""
+    if output_format == "parquet":
+        return ParquetRowWriter(os.path.join(out_dir, name + ".parquet"), columns, blank_tail)
+    return open_csv_writer(os.path.join(out_dir, name + ".csv"), columns, blank_tail)
 
 
 def make_base_row(run_id: str, timestamp: str, repo: Dict,
-                  rel_path: str, idx: int, para: str, lang: str) -> Dict:
-    return {
-        "run_id":              run_id,
-        "timestamp_utc":       timestamp,
-        "repo_id":             repo["repo_id"],
-        "source":              repo["source"],
-        "repo_origin_name":    repo["repo_origin_name"],
-        "artifact_path":       rel_path,
-        "paragraph_index":     idx,
-        "lang":                lang,
-        "candidate_type":      "",
-        "arch_hit":            "",
-        "has_style_phrase":    "",
-        "has_structural_noun": "",
-        "has_relation_verb":   "",
-        "norm_hit":            "",
-        "norm_strength":       "",
-        "excluded":            "",
-        "norm_hits":           "",
-        "arch_hits":           "",
-        "excl_hits":           "",
-        "override_hits":       "",
-        "text":                sanitize_for_csv_cell(para),
-    }
+                  rel_path: str, idx: int, para: str, lang: str) -> List[object]:
+    """A CSV_COLUMNS row (a list, see CSV_COL_IDX) with the rule fields empty."""
+    # A single list display is already the cheapest way to build the row:
+    # a generated builder compiles to the same bytecode, and concatenating a
+    # per-repo prefix measured slower
+    return [
+        run_id,                        # run_id
+        timestamp,                     # timestamp_utc
+        repo["repo_id"],               # repo_id
+        repo["source"],                # source
+        repo["repo_origin_name"],      # repo_origin_name
+        rel_path,                      # artifact_path
+        idx,                           # paragraph_index
+        lang,                          # lang
+        "",                            # candidate_type
+        "",                            # arch_hit
+        "",                            # has_style_phrase
+        "",                            # has_structural_noun
+        "",                            # has_relation_verb
+        "",                            # norm_hit
+        "",                            # norm_strength
+        "",                            # excluded
+        "",                            # norm_hits
+        "",                            # arch_hits
+        "",                            # excl_hits
+        "",                            # override_hits
+        sanitize_for_csv_cell(para),   # text
+    ]
 
 
-def make_annotation_row(base_row: Dict) -> Dict:
-    row = dict(base_row)
-    for col in ANNOTATION_EXTRA:
-        row[col] = ""
-    return row
+
+# ===============================
+# PER-REPO MINING
+# ===============================
+
+STAT_KEYS = [
+    "explicit_candidate", "arch_description", "excluded_normative",
+    "non_english", "non_natural_language",
+    "skipped_other", "files_scanned", "paragraphs_seen",
+]
+
+
+def process_repo(repo: Dict, run_id: str, timestamp: str) -> Tuple[List[List[object]], Dict[str, int]]:
+    """
+    Mine one repo. Returns the rows to write (each with candidate_type set,
+    in file/paragraph order) and the repo's stats counts.
+    Runs in a worker process, so it only touches its arguments.
+    """
+    rows: List[List[object]] = []
+    stats = {k: 0 for k in STAT_KEYS}
+
+    doc_files = sorted(collect_doc_files(repo["repo_root"]), key=lambda f: f[0].lower())
+    stats["files_scanned"] += len(doc_files)
+
+    for rel_path, raw in iter_file_texts(doc_files):
+        if not raw:
+            continue
+
+        for idx, para in enumerate(iter_paragraphs(raw)):
+            stats["paragraphs_seen"] += 1
+
+            # 1) Detect code/config FIRST to avoid inflating non_english,
+            #    then the language gate (both in one classify_paragraph call)
+            lang, tnorm = classify_paragraph(para)
+            if lang == "n/a":
+                base_row = make_base_row(run_id, timestamp, repo, rel_path, idx, para, lang="n/a")
+                base_row[CANDIDATE_TYPE_IDX] = "non_natural_language"
+                rows.append(base_row)
+                stats["non_natural_language"] += 1
+                continue
+
+            if lang != "en":
+                base_row = make_base_row(run_id, timestamp, repo, rel_path, idx, para, lang)
+                base_row[CANDIDATE_TYPE_IDX] = "non_english"
+                rows.append(base_row)
+                stats["non_english"] += 1
+                continue
+
+            fields = compute_rule_fields(tnorm, rel_path)
+            if fields is None:
+                stats["skipped_other"] += 1
+                continue
+
+            ctype = ROUTE_TABLE[fields["arch_hit"] | fields["norm_hit"] << 1 | fields["excluded"] << 2]
+
+            if ctype is None:
+                stats["skipped_other"] += 1
+                continue
+
+            # Rows are only built (and their text sanitized) once they are kept
+            base_row = make_base_row(run_id, timestamp, repo, rel_path, idx, para, lang)
+            for col, value in fields.items():
+                base_row[CSV_COL_IDX[col]] = value
+            base_row[CANDIDATE_TYPE_IDX] = ctype
+            rows.append(base_row)
+            stats[ctype] += 1
+
+    return rows, stats
 
 
 # ===============================
@@ -737,7 +1308,13 @@ def main():
                         help="Mapping CSV for GitHub repo_id (gh_XXX) -> repo_name (e.g., owner/repo). "
                              "Deterministic schema: columns repo_id, repo_name. "
                              "If omitted, uses <dataset_root>/repos.csv if present.")
+    parser.add_argument("--workers",      type=int, default=0,
+                        help="Worker processes for mining repos (0 = one per CPU, 1 = no pool).")
+    parser.add_argument("--output_format", choices=["csv", "parquet"], default="csv",
+                        help="csv (default; what the R analysis reads) or zstd Parquet (needs pyarrow).")
     args = parser.parse_args()
+    if args.output_format == "parquet" and pa is None:
+        parser.error("--output_format parquet requires pyarrow (pip install pyarrow)")
 
     ensure_dir(args.out_dir)
     ensure_dir(args.log_dir)
@@ -775,11 +1352,14 @@ def main():
     n_sf = sum(1 for r in repos if r["source"] == "sf100")
     print(f"Repos found:  {len(repos)} (GitHub={n_gh}, SF100={n_sf})")
 
-    # Open output CSVs
-    cand_writer, cand_f = open_csv_writer(os.path.join(args.out_dir, "candidates.csv"), CSV_COLUMNS)
-    arch_writer, arch_f = open_csv_writer(os.path.join(args.out_dir, "arch_descriptions.csv"), CSV_COLUMNS)
-    excl_writer, excl_f = open_csv_writer(os.path.join(args.out_dir, "excluded_normative.csv"), CSV_COLUMNS)
-    ann_writer,  ann_f  = open_csv_writer(os.path.join(args.out_dir, "annotation.csv"), ANNOTATION_COLUMNS)
+    # Open output files
+    fmt = args.output_format
+    cand_writer = open_output_writer(args.out_dir, "candidates",         CSV_COLUMNS,        fmt)
+    arch_writer = open_output_writer(args.out_dir, "arch_descriptions",  CSV_COLUMNS,        fmt)
+    excl_writer = open_output_writer(args.out_dir, "excluded_normative", CSV_COLUMNS,        fmt)
+    # annotation rows are the base rows plus the (blank) ANNOTATION_EXTRA columns
+    ann_writer  = open_output_writer(args.out_dir, "annotation",         ANNOTATION_COLUMNS, fmt,
+                                     blank_tail=len(ANNOTATION_EXTRA))
 
     # Write run log
     runlog_path = os.path.join(args.log_dir, f"run_{run_id}.log")
@@ -794,69 +1374,32 @@ def main():
             f"repos={len(repos)}\n"
         )
 
-    stats = {k: 0 for k in [
-        "explicit_candidate", "arch_description", "excluded_normative",
-        "non_english", "non_natural_language",
-        "skipped_other", "files_scanned", "paragraphs_seen",
-    ]}
+    stats = {k: 0 for k in STAT_KEYS}
 
-    try:
-        for repo in repos:
-            doc_files = collect_doc_files(repo["repo_root"])
-            stats["files_scanned"] += len(doc_files)
-
-            for fp in doc_files:
-                rel_path = os.path.relpath(fp, repo["repo_root"])
-                raw      = read_text_file(fp)
-                if not raw:
-                    continue
+    # Rows of typed candidates also go to their own CSV (all rows go to annotation.csv)
+    type_writers = {
+        "explicit_candidate": cand_writer,
+        "arch_description":   arch_writer,
+        "excluded_normative": excl_writer,
+    }
 
-                for idx, para in enumerate(split_paragraphs(raw)):
-                    stats["paragraphs_seen"] += 1
-
-                    # 1) Detect code/config FIRST to avoid inflating non_english
-                    if looks_like_code_or_config(para):
-                        base_row = make_base_row(run_id, timestamp, repo, rel_path, idx, para, lang="n/a")
-                        base_row["candidate_type"] = "non_natural_language"
-                        ann_writer.writerow(make_annotation_row(base_row))
-                        stats["non_natural_language"] += 1
-                        continue
-
-                    # 2) Then language gate
-                    lang = detect_language(para)
-                    base_row = make_base_row(run_id, timestamp, repo, rel_path, idx, para, lang)
-
-                    if lang != "en":
-                        base_row["candidate_type"] = "non_english"
-                        ann_writer.writerow(make_annotation_row(base_row))
-                        stats["non_english"] += 1
-                        continue
-
-                    fields = compute_rule_fields(para, rel_path)
-                    base_row.update(fields)
-
-                    ctype = route_candidate_type(
-                        arch_hit=int(fields["arch_hit"]),
-                        norm_hit=int(fields["norm_hit"]),
-                        excluded=int(fields["excluded"]),
-                    )
-
-                    if ctype is None:
-                        stats["skipped_other"] += 1
-                        continue
-
-                    base_row["candidate_type"] = ctype
-                    ann_writer.writerow(make_annotation_row(base_row))
-
-                    if ctype == "explicit_candidate":
-                        cand_writer.writerow(base_row)
-                        stats["explicit_candidate"] += 1
-                    elif ctype == "arch_description":
-                        arch_writer.writerow(base_row)
-                        stats["arch_description"] += 1
-                    elif ctype == "excluded_normative":
-                        excl_writer.writerow(base_row)
-                        stats["excluded_normative"] += 1
+    try:
+        # Workers mine whole repos; the CSV writers stay in this process.
+        # ex.map yields results in repo order, so the output matches a sequential run.
+        # With a single worker the pool (and its pickling) is skipped altogether.
+        workers = args.workers or os.cpu_count() or 1
+        with (ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()) as ex:
+            mine = partial(process_repo, run_id=run_id, timestamp=timestamp)
+            results = ex.map(mine, repos, chunksize=4) if ex else map(mine, repos)
+            for rows, repo_stats in results:
+                for k, v in repo_stats.items():
+                    stats[k] += v
+
+                for base_row in rows:
+                    ann_writer.writerow(base_row)
+                    writer = type_writers.get(base_row[CANDIDATE_TYPE_IDX])
+                    if writer is not None:
+                        writer.writerow(base_row)
 
         print("\nDone.")
         print("─" * 42)
@@ -868,8 +1411,8 @@ def main():
                 lf.write(f"{k}={v}\n")
 
     finally:
-        for f in (cand_f, arch_f, excl_f, ann_f):
-            f.close()
+        for writer in (cand_writer, arch_writer, excl_writer, ann_writer):
+            writer.close()
 
 
 if __name__ == "__main__":